@@ -11,13 +11,28 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 
+import orjson
 import uvicorn
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 import logging
 
+# uvloop (incluido en uvicorn[standard]) reemplaza el event loop por defecto,
+# también para los loops creados manualmente en el wrapper síncrono
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
 # Agregar paths necesarios
 sys.path.append(os.path.dirname(__file__))
 
@@ -47,14 +62,51 @@ from strict_models import (
 )
 
 # Estado global para tareas en background y progreso real
-background_tasks_status = {}
-task_progress = {}  # Nuevo: estado de progreso por task_id
+# Acotado por tamaño y TTL para que la memoria no crezca con cada /buscar.
+# Solo se accede desde el event loop, por lo que no requiere lock.
+TASK_CACHE_MAXSIZE = 10_000
+TASK_CACHE_TTL_SEGUNDOS = 3600
+background_tasks_status = TTLCache(maxsize=TASK_CACHE_MAXSIZE, ttl=TASK_CACHE_TTL_SEGUNDOS)
+task_progress = TTLCache(maxsize=TASK_CACHE_MAXSIZE, ttl=TASK_CACHE_TTL_SEGUNDOS)  # Estado de progreso por task_id
+
+# Con REDIS_URL el progreso se comparte entre workers (y sobrevive reinicios);
+# sin él se usa task_progress en memoria y el servidor corre con un solo worker.
+REDIS_URL = os.getenv("REDIS_URL")
+redis_client = None  # Se inicializa en lifespan
+
+async def leer_progreso(task_id: str) -> Optional[Dict]:
+    """Obtiene el estado de una tarea o None si no existe"""
+    if redis_client is None:
+        return task_progress.get(task_id)
+    raw = await redis_client.get(f"task:{task_id}")
+    return orjson.loads(raw) if raw is not None else None
+
+async def guardar_progreso(task_id: str, estado: Dict) -> None:
+    """Reemplaza el estado completo de una tarea"""
+    if redis_client is None:
+        task_progress[task_id] = estado
+    else:
+        await redis_client.setex(f"task:{task_id}", TASK_CACHE_TTL_SEGUNDOS, orjson.dumps(estado))
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manejador de ciclo de vida de la aplicación"""
+    global redis_client
     logger.info("🚀 Iniciando Carta Electiva API")
+    if REDIS_URL:
+        import redis.asyncio as redis_asyncio
+        redis_client = redis_asyncio.from_url(REDIS_URL)
+        logger.info("🗄️  Progreso de tareas compartido vía Redis")
+    # Executor por defecto para cálculos bloqueantes (run_in_executor / to_thread)
+    executor = ThreadPoolExecutor(max_workers=int(os.getenv("THREAD_POOL_SIZE", "16")))
+    asyncio.get_running_loop().set_default_executor(executor)
+    # Generar el esquema OpenAPI (JSON Schema de todos los modelos) al arrancar,
+    # no en la primera petición a /docs u /openapi.json
+    app.openapi()
     yield
+    executor.shutdown(wait=False)
+    if redis_client is not None:
+        await redis_client.aclose()
     logger.info("🛑 Deteniendo Carta Electiva API")
 
 # Crear aplicación FastAPI
@@ -62,16 +114,24 @@ app = FastAPI(
     title="Carta Electiva API",
     description="Servicio de cálculo de cartas electivas optimizadas para Astrowellness",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Comprimir respuestas grandes (resultado completo de /progress)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Configurar CORS
+# En producción, especificar dominios permitidos vía CORS_ORIGINS (separados por coma)
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # En producción, especificar dominios permitidos
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Cachear preflight 24h en el navegador
 )
 
 class CartaElectivaService:
@@ -80,7 +140,8 @@ class CartaElectivaService:
     def __init__(self):
         logger.info("🌟 Inicializando CartaElectivaService")
 
-    def calcular_carta_natal(self, fecha_nacimiento: datetime, lat: float, lon: float) -> Dict:
+    @staticmethod
+    def calcular_carta_natal(fecha_nacimiento: datetime, lat: float, lon: float) -> Dict:
         """
         Calcula carta natal para el usuario
 
@@ -95,7 +156,7 @@ class CartaElectivaService:
         try:
             wrapper = LegacyAstroWrapper(fecha_nacimiento, lat, lon)
             chart_data = wrapper.get_chart_data_for_enraizamiento()
-            logger.info(f"✅ Carta natal calculada para {fecha_nacimiento.strftime('%Y-%m-%d %H:%M')}")
+            logger.info("✅ Carta natal calculada para %s", fecha_nacimiento)
             return chart_data
         except Exception as e:
             logger.error(f"❌ Error calculando carta natal: {e}")
@@ -117,18 +178,18 @@ class CartaElectivaService:
             fecha_nacimiento = datetime.strptime(fecha_str, '%Y-%m-%d %H:%M')
 
             # Obtener coordenadas de la ubicación
-            lat, lon = self._obtener_coordenadas({
+            lat, lon = CartaElectivaService._obtener_coordenadas({
                 'ciudad': carta_natal_data.ciudad,
                 'pais': carta_natal_data.pais
             })
 
-            logger.info(f"📊 Calculando carta natal para: {fecha_nacimiento.strftime('%Y-%m-%d %H:%M')} ({carta_natal_data.ciudad}, {carta_natal_data.pais})")
+            logger.info("📊 Calculando carta natal para: %s (%s, %s)", fecha_str, carta_natal_data.ciudad, carta_natal_data.pais)
 
             # Calcular carta natal
             wrapper = LegacyAstroWrapper(fecha_nacimiento, lat, lon)
             chart_data = wrapper.get_chart_data_for_enraizamiento()
 
-            logger.info(f"✅ Carta natal calculada: ASC {chart_data['asc_grados']:.1f}° (signo {chart_data['asc_signo']})")
+            logger.info("✅ Carta natal calculada: ASC %.1f° (signo %s)", chart_data['asc_grados'], chart_data['asc_signo'])
             return chart_data
 
         except Exception as e:
@@ -147,8 +208,8 @@ class CartaElectivaService:
             Dict con resultados de la búsqueda
         """
         try:
-            # Parsear fecha de inicio
-            fecha_inicio = datetime.strptime(request.fecha_inicio, '%Y-%m-%d')
+            # fecha_inicio ya llega validada como date por Pydantic
+            fecha_inicio = datetime.combine(request.fecha_inicio, datetime.min.time())
 
             # Validar fecha no sea en el pasado
             hoy = datetime.now().date()
@@ -156,7 +217,7 @@ class CartaElectivaService:
                 raise HTTPException(status_code=400, detail="La fecha de inicio no puede ser anterior a hoy")
 
             # Obtener coordenadas (simplificado - en producción usar geocodificación)
-            lat, lon = self._obtener_coordenadas(request.ubicacion)
+            lat, lon = CartaElectivaService._obtener_coordenadas(request.ubicacion)
 
             # Calcular rango de fechas
             fecha_fin = fecha_inicio + timedelta(days=request.dias)
@@ -165,10 +226,10 @@ class CartaElectivaService:
             algoritmo = AlgoritmoBusqueda(carta_natal, request.tema, lat, lon)
 
             # Medir tiempo de ejecución
-            tiempo_inicio = datetime.now()
+            tiempo_inicio = time.perf_counter()
 
             # Ejecutar búsqueda optimizada con timeout de 5 minutos
-            logger.info(f"⚡ Ejecutando búsqueda para tema '{request.tema}' ({request.dias} días) - Timeout: 5 min")
+            logger.info("⚡ Ejecutando búsqueda para tema '%s' (%s días) - Timeout: 5 min", request.tema, request.dias)
 
             try:
                 # Ejecutar búsqueda en un thread separado para poder timeout
@@ -184,8 +245,7 @@ class CartaElectivaService:
                     detail="La búsqueda tomó más de 5 minutos. Inténtalo con un período más corto (máximo 30 días recomendado)."
                 )
 
-            tiempo_fin = datetime.now()
-            tiempo_total = (tiempo_fin - tiempo_inicio).total_seconds()
+            tiempo_total = time.perf_counter() - tiempo_inicio
 
             # Preparar estadísticas
             estadisticas = {
@@ -194,31 +254,34 @@ class CartaElectivaService:
                 'factor_optimizacion': f"{algoritmo.calculos_fase_1 + algoritmo.calculos_fase_2} cálculos"
             }
 
-            # Extraer valores de enraizamiento para calcular SCC
+            # Una sola pasada sobre el Top 20: formato API + valores para SCC
+            momentos = []
             valores_enraizamiento = []
-            for momento in mejores_momentos[:20]:
-                # Extraer puntos de enraizamiento
-                enraizamiento_puntos = self._extraer_enraizamiento_puntos(momento)
-                valores_enraizamiento.append(enraizamiento_puntos)
+            for i, momento in enumerate(islice(mejores_momentos, 20), 1):
+                valores_enraizamiento.append(CartaElectivaService._extraer_enraizamiento_puntos(momento))
 
-            # Convertir momentos a formato API con categorías SCC correctas
-            momentos = []
-            for i, momento in enumerate(mejores_momentos[:20], 1):  # Top 20
-                # Calcular categoría usando SCC
-                enraizamiento_puntos = valores_enraizamiento[i-1]
-                scc_data = SCC_Calculator.calcular_scc(enraizamiento_puntos, valores_enraizamiento)
-                categoria = scc_data['categoria']
+                enraizamiento_pct = momento.get('enraizamiento_pct')
+                if enraizamiento_pct is None:
+                    enraizamiento_pct = momento.get('enraizamiento_score', 0) * 100
+                calidad_pct = momento.get('calidad_pct')
+                if calidad_pct is None:
+                    calidad_pct = momento.get('calidad_score', 0) * 100
 
                 momentos.append({
                     'ranking': i,
-                    'fecha_hora': momento['fecha_hora'].strftime('%Y-%m-%dT%H:%M:%S'),
+                    'fecha_hora': momento['fecha_hora'],  # orjson serializa datetime como ISO 8601
                     'puntuacion_total': momento['puntuacion_total'],
-                    'enraizamiento_pct': momento.get('enraizamiento_pct', momento.get('enraizamiento_score', 0) * 100),
-                    'calidad_pct': momento.get('calidad_pct', momento.get('calidad_score', 0) * 100),
-                    'categoria': categoria
+                    'enraizamiento_pct': enraizamiento_pct,
+                    'calidad_pct': calidad_pct,
+                    'categoria': None
                 })
 
-            logger.info(f"✅ Búsqueda completada: {len(momentos)} momentos encontrados en {tiempo_total:.2f}s")
+            # Categorías SCC: referencia del período calculada una sola vez
+            scc_stats = SCC_Calculator.precalcular_stats(valores_enraizamiento)
+            for momento_api, enraizamiento_puntos in zip(momentos, valores_enraizamiento):
+                momento_api['categoria'] = SCC_Calculator.categoria_desde_stats(enraizamiento_puntos, scc_stats)
+
+            logger.info("✅ Búsqueda completada: %d momentos encontrados en %.2fs", len(momentos), tiempo_total)
 
             return {
                 'momentos': momentos,
@@ -236,17 +299,11 @@ class CartaElectivaService:
         """
         Wrapper síncrono para compatibilidad
         """
-        # Crear event loop si no existe
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        # asyncio.run crea, ejecuta y cierra su propio loop (uvloop si está instalado)
+        return asyncio.run(self.buscar_momentos_electivos_async(request, carta_natal))
 
-        # Ejecutar búsqueda asíncrona
-        return loop.run_until_complete(self.buscar_momentos_electivos_async(request, carta_natal))
-
-    def _extraer_enraizamiento_puntos(self, momento: Dict) -> float:
+    @staticmethod
+    def _extraer_enraizamiento_puntos(momento: Dict) -> float:
         """
         Extrae los puntos de enraizamiento de un momento
 
@@ -256,25 +313,24 @@ class CartaElectivaService:
         Returns:
             Puntos de enraizamiento como float
         """
-        # Intentar obtener de detalles.enraizamiento_puro.puntos_total
-        detalles = momento.get('detalles', {})
-        if detalles and 'enraizamiento_puro' in detalles:
-            enraizamiento_data = detalles['enraizamiento_puro']
-            if isinstance(enraizamiento_data, dict) and 'puntos_total' in enraizamiento_data:
-                return float(enraizamiento_data['puntos_total'])
+        # Caso habitual: detalles.enraizamiento_puro.puntos_total (EAFP, sin chequeos previos)
+        try:
+            return float(momento['detalles']['enraizamiento_puro']['puntos_total'])
+        except (KeyError, TypeError):
+            pass
 
         # Fallback: intentar de enraizamiento_score
-        if 'enraizamiento_score' in momento:
+        score = momento.get('enraizamiento_score')
+        if score is not None:
             # Si es un score 0-1, convertir aproximado a puntos
-            score = momento['enraizamiento_score']
             if 0 <= score <= 1:
                 # Aproximación: score 0.5 ≈ 2 puntos (promedio)
                 return (score - 0.5) * 8  # Escala aproximada
 
         # Último fallback: intentar de enraizamiento_pct
-        if 'enraizamiento_pct' in momento:
+        pct = momento.get('enraizamiento_pct')
+        if pct is not None:
             # Convertir porcentaje aproximado a puntos
-            pct = momento['enraizamiento_pct']
             if 0 <= pct <= 100:
                 # Aproximación: 50% ≈ 2 puntos
                 return (pct / 50.0) - 2.0
@@ -283,7 +339,8 @@ class CartaElectivaService:
         logger.warning(f"No se pudo extraer enraizamiento de momento: {momento.get('fecha_hora', 'N/A')}")
         return 0.0
 
-    def _obtener_coordenadas(self, ubicacion: Dict[str, str]) -> tuple[float, float]:
+    @staticmethod
+    def _obtener_coordenadas(ubicacion: Dict[str, str]) -> tuple[float, float]:
         """
         Obtiene coordenadas de una ubicación (simplificado)
 
@@ -293,22 +350,36 @@ class CartaElectivaService:
         Returns:
             Tuple (lat, lon)
         """
-        # Para esta implementación inicial, usar coordenadas hardcodeadas
-        # En producción, integrar con servicio de geocodificación
-        ciudad = ubicacion.get('ciudad', '').lower()
-        pais = ubicacion.get('pais', '').lower()
-
-        # Coordenadas de ejemplo
-        if 'buenos aires' in ciudad and 'argentina' in pais:
-            return -34.6037, -58.3816
-        elif 'madrid' in ciudad and 'españa' in pais:
-            return 40.4168, -3.7038
-        elif 'méxico' in ciudad and 'méxico' in pais:
-            return 19.4326, -99.1332
-        else:
-            # Buenos Aires por defecto
-            logger.warning(f"Ubicación no reconocida: {ubicacion}, usando Buenos Aires por defecto")
-            return -34.6037, -58.3816
+        return _geocode(ubicacion.get('ciudad', ''), ubicacion.get('pais', ''))
+
+@lru_cache(maxsize=1024)
+def _geocode(ciudad: str, pais: str) -> tuple[float, float]:
+    """
+    Resuelve coordenadas para (ciudad, país), cacheado por par de strings
+
+    Args:
+        ciudad: Nombre de la ciudad
+        pais: Nombre del país
+
+    Returns:
+        Tuple (lat, lon)
+    """
+    # Para esta implementación inicial, usar coordenadas hardcodeadas
+    # En producción, integrar con servicio de geocodificación
+    ciudad_lower = ciudad.lower()
+    pais_lower = pais.lower()
+
+    # Coordenadas de ejemplo
+    if 'buenos aires' in ciudad_lower and 'argentina' in pais_lower:
+        return -34.6037, -58.3816
+    elif 'madrid' in ciudad_lower and 'españa' in pais_lower:
+        return 40.4168, -3.7038
+    elif 'méxico' in ciudad_lower and 'méxico' in pais_lower:
+        return 19.4326, -99.1332
+    else:
+        # Buenos Aires por defecto
+        logger.warning(f"Ubicación no reconocida: {ciudad}, {pais}, usando Buenos Aires por defecto")
+        return -34.6037, -58.3816
 
 # Instancia del servicio
 service = CartaElectivaService()
@@ -362,14 +433,14 @@ async def buscar_momentos_electivos(request: BusquedaRequest, background_tasks:
         task_id = str(uuid.uuid4())
 
         # Inicializar progreso
-        task_progress[task_id] = {
+        await guardar_progreso(task_id, {
             "progress": 0,
             "status": "Iniciando búsqueda...",
             "result": None,
             "error": None
-        }
+        })
 
-        logger.info(f"🔍 Nueva búsqueda: task_id={task_id}, user={request.user_id}, tema={request.tema}, dias={request.dias}")
+        logger.info("🔍 Nueva búsqueda: task_id=%s, user=%s, tema=%s, dias=%s", task_id, request.user_id, request.tema, request.dias)
 
         # Iniciar búsqueda en background
         background_tasks.add_task(run_search_background, task_id, request)
@@ -393,18 +464,18 @@ async def buscar_fechas_v2(request: BusquedaRequest, background_tasks: Backgroun
     Endpoint OPTIMIZADO V2 para búsqueda de fechas electivas.
     Usa el motor vectorizado (NumPy/SwissEph) para respuesta instantánea.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     task_id = str(uuid.uuid4())
-    logger.info(f"🚀 Iniciando búsqueda V2 [ID: {task_id}] | Tema: {request.tema}")
+    logger.info("🚀 Iniciando búsqueda V2 [ID: %s] | Tema: %s", task_id, request.tema)
 
     try:
         # 1. Parsear Datos
-        fecha_inicio = datetime.strptime(request.fecha_inicio, "%Y-%m-%d").replace(hour=0, minute=0, second=0)
+        fecha_inicio = datetime.combine(request.fecha_inicio, datetime.min.time())
         # Default 30 dias si no se especifica
         fecha_fin = fecha_inicio + timedelta(days=request.dias)
         
         # 2. Coordenadas
-        lat, lon = service._obtener_coordenadas(request.ubicacion)
+        lat, lon = CartaElectivaService._obtener_coordenadas(request.ubicacion)
         
         # 3. Datos Natales
         # Necesitamos la carta natal para el motor v2.
@@ -462,7 +533,7 @@ async def buscar_fechas_v2(request: BusquedaRequest, background_tasks: Backgroun
                 }
             })
             
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         
         stats = {
             "total_momentos": len(df),
@@ -492,11 +563,10 @@ async def get_progress(task_id: str):
     """
     Consulta el progreso de una tarea de búsqueda
     """
-    if task_id not in task_progress:
+    progress_data = await leer_progreso(task_id)
+    if progress_data is None:
         return {"error": "Task ID no encontrado"}
 
-    progress_data = task_progress[task_id]
-
     # Si la tarea está completa, devolver resultado
     if progress_data["progress"] >= 100 and progress_data["result"]:
         return {
@@ -523,33 +593,38 @@ async def run_search_background(task_id: str, request: BusquedaRequest):
     """
     Ejecuta la búsqueda en background con actualizaciones de progreso real
     """
+    # Estado local de la tarea: se modifica en memoria y se escribe
+    # completo una sola vez por fase (un único SETEX con Redis)
+    estado = {"progress": 5, "status": "Calculando carta natal...", "result": None, "error": None}
     try:
         # Actualizar progreso: Iniciando
-        task_progress[task_id]["progress"] = 5
-        task_progress[task_id]["status"] = "Calculando carta natal..."
+        await guardar_progreso(task_id, estado)
 
-        # Calcular carta natal
-        carta_natal = service.calcular_carta_natal_desde_datos(request.carta_natal)
+        # Calcular carta natal fuera del event loop (cálculo bloqueante)
+        carta_natal = await asyncio.to_thread(service.calcular_carta_natal_desde_datos, request.carta_natal)
 
         # Actualizar progreso: Carta natal lista
-        task_progress[task_id]["progress"] = 20
-        task_progress[task_id]["status"] = "Analizando constelaciones básicas..."
+        estado["progress"] = 20
+        estado["status"] = "Analizando constelaciones básicas..."
+        await guardar_progreso(task_id, estado)
 
         # Ejecutar búsqueda completa
         resultado = await service.buscar_momentos_electivos_async(request, carta_natal)
 
         # Actualizar progreso: Completado
-        task_progress[task_id]["progress"] = 100
-        task_progress[task_id]["status"] = "Búsqueda completada"
-        task_progress[task_id]["result"] = resultado
+        estado["progress"] = 100
+        estado["status"] = "Búsqueda completada"
+        estado["result"] = resultado
+        await guardar_progreso(task_id, estado)
 
-        logger.info(f"✅ Búsqueda completada: task_id={task_id}, momentos={len(resultado.get('momentos', []))}")
+        logger.info("✅ Búsqueda completada: task_id=%s, momentos=%d", task_id, len(resultado.get('momentos', [])))
 
     except Exception as e:
         logger.error(f"❌ Error en búsqueda background task_id={task_id}: {e}")
-        task_progress[task_id]["progress"] = -1
-        task_progress[task_id]["status"] = f"Error: {str(e)}"
-        task_progress[task_id]["error"] = str(e)
+        estado["progress"] = -1
+        estado["status"] = f"Error: {str(e)}"
+        estado["error"] = str(e)
+        await guardar_progreso(task_id, estado)
 
 # Método auxiliar para generar carta natal de ejemplo (temporal)
 def _generar_carta_natal_ejemplo(service_instance=None) -> Dict:
@@ -586,11 +661,20 @@ def _generar_carta_natal_ejemplo(service_instance=None) -> Dict:
 CartaElectivaService._generar_carta_natal_ejemplo = staticmethod(_generar_carta_natal_ejemplo)
 
 if __name__ == "__main__":
+    # Autoreload solo en desarrollo. Varios workers solo si el progreso
+    # se comparte vía Redis; con el estado en memoria, /progress necesita
+    # llegar al mismo proceso que ejecuta la búsqueda.
+    reload = os.getenv("ENV") == "dev"
+    workers = 1 if reload or not REDIS_URL else max(2, os.cpu_count() or 1)
+
     # Ejecutar servidor
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
         port=8005,
-        reload=True,
+        loop="uvloop" if uvloop else "asyncio",
+        http="httptools",
+        reload=reload,
+        workers=workers,
         log_level="info"
     )
@@ -2,7 +2,7 @@
 Configuraciones del sistema de carta electiva optimizada
 """
 
-from .temas_casas import TEMAS_CASAS, get_casa_for_tema, get_temas_disponibles, get_descripcion_tema
+from .temas_casas import TEMAS_CASAS, TEMAS_VALIDOS, get_casa_for_tema, get_temas_disponibles, get_descripcion_tema
 from .settings import (
     FASE_1_INTERVALO_HORAS, FASE_2_INTERVALO_MINUTOS, FASE_3_INTERVALO_MINUTOS,
     PESO_ENRAIZAMIENTO, PESO_CALIDAD,
@@ -14,7 +14,7 @@ from .settings import (
 )
 
 __all__ = [
-    'TEMAS_CASAS', 'get_casa_for_tema', 'get_temas_disponibles', 'get_descripcion_tema',
+    'TEMAS_CASAS', 'TEMAS_VALIDOS', 'get_casa_for_tema', 'get_temas_disponibles', 'get_descripcion_tema',
     'FASE_1_INTERVALO_HORAS', 'FASE_2_INTERVALO_MINUTOS', 'FASE_3_INTERVALO_MINUTOS',
     'PESO_ENRAIZAMIENTO', 'PESO_CALIDAD',
     'ORBE_CONJUNCION', 'ORBE_TRIGONO_SEXTIL',
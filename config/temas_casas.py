@@ -29,6 +29,11 @@ DESCRIPCIONES_TEMAS = {
     'espiritualidad': 'Espiritualidad, karma, sacrificio, retiro'
 }
 
+# TEMAS_CASAS no cambia en runtime: se precalculan la secuencia y el
+# conjunto de temas (validación O(1) en cada request)
+_TEMAS_DISPONIBLES = tuple(TEMAS_CASAS)
+TEMAS_VALIDOS = frozenset(_TEMAS_DISPONIBLES)
+
 def get_casa_for_tema(tema):
     """
     Obtiene el número de casa para un tema dado
@@ -49,12 +54,12 @@ def get_casa_for_tema(tema):
 
 def get_temas_disponibles():
     """
-    Obtiene lista de todos los temas disponibles
+    Obtiene todos los temas disponibles
     
     Returns:
-        list: Lista de nombres de temas
+        tuple: Nombres de temas (inmutable, compartido)
     """
-    return list(TEMAS_CASAS.keys())
+    return _TEMAS_DISPONIBLES
 
 def get_descripcion_tema(tema):
     """
@@ -12,13 +12,29 @@ import os
 from datetime import datetime, timedelta
 from typing import List, Tuple, Dict, Any
 import logging
+import heapq
+import time
+import threading
 import multiprocessing as mp
 import concurrent.futures
+from functools import partial
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+import pandas as pd
+import pytz
+from timezonefinder import TimezoneFinder
+from cachetools import LRUCache
 
-from core.legacy_wrapper import LegacyAstroWrapper
+# Varios módulos de core agregan la misma raíz; se agrega una sola vez
+_RAIZ_PROYECTO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _RAIZ_PROYECTO not in sys.path:
+    sys.path.append(_RAIZ_PROYECTO)
+
+from core.legacy_wrapper import get_wrapper
+from legacy_astro.chart_cache import natal_cacheado
 from core.enraizamiento_calculator import EnraizamientoCalculator
+from core.vectorized_ephemeris import VectorizedEphemeris
+from core.vectorized_logic import VectorizedLogic
 from utils.scc_calculator import SCC_Calculator
 from config import (
     FASE_1_INTERVALO_HORAS, FASE_2_INTERVALO_MINUTOS,
@@ -31,6 +47,46 @@ logger = logging.getLogger(__name__)
 
 # Constantes para sistema de puntuación porcentual
 PUNTUACION_MAXIMA_TEORICA = 81.6  # Máximo teórico: (100 * 0.8) + (8 * 0.2) = 81.6
+_PESO_ENRAIZAMIENTO_PCT = 0.8 * 100 / PUNTUACION_MAXIMA_TEORICA
+_PESO_CALIDAD_PCT = 0.2 * 100 / PUNTUACION_MAXIMA_TEORICA
+
+# Rango del Puntaje Ranking (Luna + regente ASC + regente Casa 10 + combinaciones)
+PUNTOS_RANKING_MAXIMOS = 32.0  # 10+10+6+6 = 32 (corregido con Luna 10 puntos)
+PUNTOS_RANKING_MINIMOS = -2.0  # Solo penalizaciones negativas
+_ESCALA_RANKING = 100.0 / (PUNTOS_RANKING_MAXIMOS - PUNTOS_RANKING_MINIMOS)
+_COMPONENTES_RANKING_VACIOS = (float('nan'),) * 5  # Sin detalles de Fase 1 -> puntaje 0
+
+# Prefiltro vectorizado de Fase 1 (mismos criterios que moonAptitude.moonSunConj)
+ORBE_LUNA_SOL = 8.0
+SIGNOS_LUNA_DESCALIFICADA = [7, 9]  # Escorpio, Capricornio (índices 0-11)
+# Luna vacía de curso (moonEmpty): sin aspecto aplicativo a Mercurio ni Júpiter,
+# salvo en Tauro/Cáncer. Se descarta solo si no hay NINGÚN aspecto dentro de orbe,
+# con los orbes de astro_avanzada_settings (ángulo, orbe)
+SIGNOS_LUNA_NUNCA_VACIA = [1, 3]  # Tauro, Cáncer (índices 0-11)
+PLANETAS_CURSO_LUNA = [2, 5]  # Mercurio, Júpiter (IDs SwissEph)
+ORBES_ASPECTOS_IMMANUEL = (
+    (0, 10.0), (180, 10.0), (90, 10.0), (120, 10.0), (60, 6.0),
+    (360 / 7, 3.0), (45, 3.0), (135, 3.0), (30, 3.0), (150, 3.0),
+    (72, 2.0), (144, 2.0)
+)
+# Resultados de Fase 1 compartidos entre búsquedas del proceso: el filtro
+# básico depende solo de (momento, lat, lon), no del tema consultado
+CACHE_FASE1_MAXSIZE = 200_000
+_cache_fase1 = LRUCache(maxsize=CACHE_FASE1_MAXSIZE)
+_cache_fase1_lock = threading.Lock()  # Las búsquedas corren en threads del executor
+
+# Intervalo mínimo entre logs de progreso de Fase 2 (segundos)
+INTERVALO_LOG_PROGRESO = 1.0
+
+# Solo se descartan momentos claramente dentro del descalificador; los casos
+# límite siguen pasando por la evaluación completa con immanuel.
+MARGEN_PREFILTRO_GRADOS = 0.05
+
+# Contexto de multiprocessing para los pools de Fase 1 y Fase 2. En Linux,
+# 'fork': los workers heredan la carta natal A y los argumentos del
+# initializer sin serializarlos. En macOS/Windows se mantiene 'spawn'
+# (fork no es seguro con los frameworks del sistema en macOS).
+_MP_CONTEXT = mp.get_context('fork' if sys.platform.startswith('linux') else 'spawn')
 
 class AlgoritmoBusqueda:
     """
@@ -78,19 +134,15 @@ class AlgoritmoBusqueda:
         """
         logger.info(f"🚀 Iniciando búsqueda optimizada para tema '{self.tema_consulta}'")
         logger.info(f"📅 Rango: {fecha_inicio.strftime('%Y-%m-%d')} a {fecha_fin.strftime('%Y-%m-%d')}")
+
+        # Cartas de búsquedas anteriores no se reutilizan: liberar antes de
+        # crear los pools (los workers heredan el cache del proceso padre)
+        natal_cacheado.cache_clear()
         
-        # FASE 1: Filtro básico (cada 30 minutos)
-        logger.info(f"🔍 FASE 1: Filtro básico (cada {FASE_1_INTERVALO_HORAS * 60:.0f} minutos)")
-        momentos_prometedores = self._fase_1_filtro_basico(fecha_inicio, fecha_fin)
-        logger.info(f"   Momentos prometedores encontrados: {len(momentos_prometedores)}")
-        
-        if not momentos_prometedores:
-            logger.warning("⚠️  No se encontraron momentos prometedores en Fase 1")
-            return []
-        
-        # FASE 2: REDISEÑO SIMPLIFICADO - Análisis directo y retorno de resultados finales
-        logger.info(f"🎯 FASE 2: Análisis completo de {len(momentos_prometedores)} momentos prometedores")
-        momentos_finales = self._fase_2_enraizamiento(momentos_prometedores)
+        # FASE 1 + FASE 2 en cadena: cada momento que pasa el filtro básico
+        # (cada 30 minutos) entra de inmediato al análisis completo
+        logger.info(f"🔍 FASE 1 → FASE 2 en cadena (filtro cada {FASE_1_INTERVALO_HORAS * 60:.0f} minutos)")
+        momentos_finales = self._fases_en_cadena(fecha_inicio, fecha_fin)
         logger.info(f"   ✅ Momentos óptimos encontrados: {len(momentos_finales)}")
         
         # Estadísticas finales
@@ -108,51 +160,212 @@ class AlgoritmoBusqueda:
         
         return momentos_finales
     
-    def _fase_1_filtro_basico(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[datetime]:
+    def _momentos_pendientes_fase1(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[datetime]:
         """
-        Fase 1: Elimina períodos obviamente inadecuados
-        Versión PARALELIZADA - Analiza cada 30 minutos para filtrar momentos básicamente no aptos
+        Genera la grilla de Fase 1 y aplica el prefiltro vectorizado
+        Retorna los momentos que requieren la evaluación completa
         """
-        logger.info(f"⚡ Iniciando Fase 1 paralelizada...")
-
         # 1. Generar lista de momentos cada 30 minutos
         momentos_fase1 = self._generar_momentos_fase1(fecha_inicio, fecha_fin)
         logger.info(f"📅 Generados {len(momentos_fase1)} momentos para filtrar")
 
-        # 2. Procesar en paralelo usando MULTIPROCESSING (mejor que Threading)
-        cores_disponibles = mp.cpu_count()
-        num_procesos = min(cores_disponibles, len(momentos_fase1))
+        # 2. Prefiltro vectorizado: Sol/Luna de todo el rango en una sola pasada
+        descartados = self._prefiltro_vectorizado(momentos_fase1)
+        momentos_pendientes = momentos_fase1[~descartados]
+        descartados_prefiltro = len(momentos_fase1) - len(momentos_pendientes)
+        self.calculos_fase_1 += descartados_prefiltro
+        logger.info(f"🧮 Prefiltro vectorizado: {descartados_prefiltro} momentos descartados")
+
+        # Los workers (LegacyAstroWrapper / immanuel) reciben datetime de Python
+        return momentos_pendientes.astype('datetime64[us]').tolist()
 
-        logger.info(f"🖥️  Usando {num_procesos} procesos (de {cores_disponibles} núcleos disponibles)")
+    def _separar_fase1_en_cache(self, momentos: List[datetime]) -> Tuple[List[datetime], List[datetime]]:
+        """
+        Consulta el cache de Fase 1 (compartido entre temas y búsquedas)
 
-        # Crear argumentos para la función estática
-        args_list = [(momento, self.lat, self.lon) for momento in momentos_fase1]
+        Returns:
+            (aptos ya evaluados, momentos sin resultado en cache)
+        """
+        lat, lon = round(self.lat, 4), round(self.lon, 4)
+        aptos_en_cache = []
+        sin_cache = []
+        with _cache_fase1_lock:
+            for momento in momentos:
+                es_apto = _cache_fase1.get((momento, lat, lon))
+                if es_apto is None:
+                    sin_cache.append(momento)
+                elif es_apto:
+                    aptos_en_cache.append(momento)
+
+        en_cache = len(momentos) - len(sin_cache)
+        self.calculos_fase_1 += en_cache
+        if en_cache:
+            logger.info(f"♻️  Fase 1 en cache: {en_cache} momentos ({len(aptos_en_cache)} aptos)")
+        return aptos_en_cache, sin_cache
+
+    def _guardar_fase1_en_cache(self, resultados) -> None:
+        """
+        Registra pares (momento, es_apto) de Fase 1 para búsquedas posteriores
+        """
+        lat, lon = round(self.lat, 4), round(self.lon, 4)
+        with _cache_fase1_lock:
+            for momento, es_apto in resultados:
+                _cache_fase1[(momento, lat, lon)] = es_apto
 
-        with mp.Pool(processes=num_procesos) as pool:
-            resultados = pool.starmap(procesar_momento_fase1_estatico, args_list)
+    def _fases_en_cadena(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[Dict]:
+        """
+        Fase 1 y Fase 2 solapadas: el pool de Fase 1 entrega los momentos aptos
+        a medida que los filtra (imap_unordered) y cada uno se envía enseguida
+        al pool de Fase 2, sin esperar a que termine todo el filtro.
+        Los envíos a Fase 2 en vuelo se acotan para limitar memoria.
+        """
+        aptos_en_cache, momentos_pendientes = self._separar_fase1_en_cache(
+            self._momentos_pendientes_fase1(fecha_inicio, fecha_fin)
+        )
+        if not momentos_pendientes and not aptos_en_cache:
+            logger.warning("⚠️  No se encontraron momentos prometedores en Fase 1")
+            return []
 
-        # Contar cálculos y filtrar momentos aptos
-        momentos_prometedores = []
-        for momento, es_apto in zip(momentos_fase1, resultados):
-            self.calculos_fase_1 += 1
-            if es_apto:
-                momentos_prometedores.append(momento)
+        num_procesos = min(mp.cpu_count(), max(len(momentos_pendientes), len(aptos_en_cache)))
+        max_en_vuelo = num_procesos * 2
+        logger.info(f"🖥️  Usando {num_procesos} procesos por fase (máx. {max_en_vuelo} momentos en vuelo en Fase 2)")
 
-        logger.info(f"✅ Fase 1 completada: {len(momentos_prometedores)} momentos prometedores")
-        return momentos_prometedores
+        evaluar = partial(evaluar_momento_fase1_estatico, lat=self.lat, lon=self.lon)
+        chunksize = max(1, len(momentos_pendientes) // (num_procesos * 8))
 
-    def _generar_momentos_fase1(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[datetime]:
+        momentos_prometedores = 0
+        momentos_enraizados = []
+        en_vuelo = {}
+        agregar_enraizado = momentos_enraizados.append
+        quitar_en_vuelo = en_vuelo.pop
+        ultimo_log = time.monotonic()
+
+        def recoger(futuros_listos):
+            nonlocal ultimo_log
+            for futuro in futuros_listos:
+                momento = quitar_en_vuelo(futuro)
+                self.calculos_fase_2 += 1
+                ahora = time.monotonic()
+                if ahora - ultimo_log >= INTERVALO_LOG_PROGRESO:
+                    logger.info("📊 Progreso Fase 2: %d momentos analizados", self.calculos_fase_2)
+                    ultimo_log = ahora
+                try:
+                    resultado = futuro.result()
+                    if resultado:
+                        agregar_enraizado(resultado)
+                except Exception as e:
+                    logger.warning("Error procesando momento %s: %s", momento, e)
+
+        def enviar_a_fase2(momento):
+            nonlocal momentos_prometedores
+            momentos_prometedores += 1
+            if len(en_vuelo) >= max_en_vuelo:
+                listos, _ = concurrent.futures.wait(en_vuelo, return_when=concurrent.futures.FIRST_COMPLETED)
+                recoger(listos)
+            en_vuelo[executor.submit(procesar_momento_fase2_estatico, momento)] = momento
+
+        with _MP_CONTEXT.Pool(processes=num_procesos) as pool, concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_procesos,
+            mp_context=_MP_CONTEXT,
+            initializer=_init_worker_fase2,
+            initargs=(self.carta_natal_A, self.tema_consulta, self.lat, self.lon)
+        ) as executor:
+            # Los aptos de búsquedas anteriores entran a Fase 2 sin pasar por el pool de Fase 1
+            for momento in aptos_en_cache:
+                enviar_a_fase2(momento)
+
+            resultados_fase1 = []
+            for momento, es_apto in pool.imap_unordered(evaluar, momentos_pendientes, chunksize=chunksize):
+                self.calculos_fase_1 += 1
+                resultados_fase1.append((momento, es_apto))
+                if es_apto:
+                    enviar_a_fase2(momento)
+
+            recoger(list(concurrent.futures.as_completed(list(en_vuelo))))
+
+        self._guardar_fase1_en_cache(resultados_fase1)
+        logger.info(f"   Momentos prometedores encontrados (Fase 1): {momentos_prometedores}")
+        logger.info(f"✅ Procesamiento en cadena completado: {len(momentos_enraizados)} momentos aptos")
+
+        return self._rankear_momentos_enraizados(momentos_enraizados)
+
+    def _generar_momentos_fase1(self, fecha_inicio: datetime, fecha_fin: datetime) -> np.ndarray:
         """
-        Genera lista de momentos cada 30 minutos para Fase 1
+        Genera los momentos cada 30 minutos para Fase 1
+        Grilla construida en un solo paso (extremos incluidos), como
+        array datetime64[s] de hora local sin zona
         """
-        momentos = []
-        fecha_actual = fecha_inicio
+        intervalo = f"{int(FASE_1_INTERVALO_HORAS * 60)}min"  # Mantiene granularidad de 30 min
+        return pd.date_range(fecha_inicio, fecha_fin, freq=intervalo).values.astype('datetime64[s]')
 
-        while fecha_actual <= fecha_fin:
-            momentos.append(fecha_actual)
-            fecha_actual += timedelta(minutes=30)  # Mantiene granularidad de 30 min
+    def _prefiltro_vectorizado(self, momentos: np.ndarray) -> np.ndarray:
+        """
+        Evalúa en lote los descalificadores de Fase 1 que dependen solo de
+        longitudes planetarias: conjunción/oposición Sol ±8°, Luna en
+        Escorpio/Capricornio y Luna vacía de curso sin ningún aspecto a
+        Mercurio/Júpiter. Las efemérides de todo el rango se calculan en
+        una sola llamada en vez de una carta por momento.
 
-        return momentos
+        Returns:
+            Array booleano, True si el momento queda descartado sin evaluación completa
+        """
+        descartados = np.zeros(len(momentos), dtype=bool)
+        if not len(momentos):
+            return descartados
+
+        try:
+            zona = pytz.timezone(TimezoneFinder().timezone_at(lng=self.lon, lat=self.lat))
+        except Exception as e:
+            logger.warning(f"Prefiltro vectorizado omitido (zona horaria): {e}")
+            return descartados
+
+        # immanuel interpreta los momentos como hora local del lugar; se
+        # convierten a UTC. Horas ambiguas/inexistentes (cambio de horario)
+        # quedan para la evaluación completa (NaT).
+        locales = pd.DatetimeIndex(momentos).tz_localize(zona, ambiguous='NaT', nonexistent='NaT')
+        decidibles = ~locales.isna()
+        momentos_utc = np.where(
+            decidibles,
+            locales.tz_convert('UTC').tz_localize(None).values.astype('datetime64[s]'),
+            momentos
+        )
+
+        # VectorizedEphemeris convierte a Julian Day desde objetos datetime
+        ephemeris = VectorizedEphemeris()
+        longitudes = ephemeris.get_longitudes(ephemeris.calculate_positions(
+            momentos_utc.astype('datetime64[us]').astype(object), [0, 1] + PLANETAS_CURSO_LUNA
+        ))
+        sol, luna = longitudes[0], longitudes[1]
+        if not all(np.any(longitudes[pid]) for pid in longitudes):
+            # calculate_positions devuelve ceros si falla SwissEph
+            return descartados
+
+        logic = VectorizedLogic()
+        margen = MARGEN_PREFILTRO_GRADOS
+
+        # Conjunción/oposición Luna-Sol dentro del orbe
+        diff = logic.calculate_aspects(sol, luna)
+        mask_sol = (diff <= ORBE_LUNA_SOL - margen) | (diff >= 180 - ORBE_LUNA_SOL + margen)
+
+        # Luna en Escorpio/Capricornio, lejos de las cúspides de signo
+        grados_en_signo = luna % 30
+        lejos_de_cuspide = (grados_en_signo >= margen) & (grados_en_signo <= 30 - margen)
+        mask_signo = logic.mask_signs(luna, SIGNOS_LUNA_DESCALIFICADA) & lejos_de_cuspide
+
+        # Luna vacía de curso: ningún aspecto posible (aplicativo o no) con
+        # Mercurio ni Júpiter dentro de los orbes configurados
+        con_aspecto = np.zeros(len(momentos), dtype=bool)
+        for pid in PLANETAS_CURSO_LUNA:
+            diff = logic.calculate_aspects(luna, longitudes[pid])
+            for angulo, orbe in ORBES_ASPECTOS_IMMANUEL:
+                con_aspecto |= np.abs(diff - angulo) <= orbe + margen
+        mask_vacia = (
+            ~con_aspecto
+            & ~logic.mask_signs(luna, SIGNOS_LUNA_NUNCA_VACIA)
+            & lejos_de_cuspide
+        )
+
+        return (mask_sol | mask_signo | mask_vacia) & decidibles
 
     def _procesar_momento_fase1(self, momento: datetime) -> bool:
         """
@@ -161,7 +374,7 @@ class AlgoritmoBusqueda:
         """
         try:
             # Crear wrapper para evaluación rápida
-            wrapper = LegacyAstroWrapper(momento, self.lat, self.lon)
+            wrapper = get_wrapper(momento, self.lat, self.lon)
 
             # Solo verificar descalificadores críticos (muy rápido)
             es_descalificado, razon = wrapper.es_momento_critico_descalificado()
@@ -174,62 +387,37 @@ class AlgoritmoBusqueda:
             # En caso de error, considerar apto para no perder oportunidades
             return True
 
-    def _fase_2_enraizamiento(self, momentos_prometedores: List[datetime]) -> List[Dict]:
+    def _rankear_momentos_enraizados(self, momentos_enraizados: List[Dict]) -> List[Dict]:
         """
-        REDISEÑO SIMPLIFICADO: Análisis directo de momentos prometedores
-        SIN ventanas superpuestas - analiza ÚNICAMENTE los momentos filtrados
-
-        Elimina completamente las duplicaciones del algoritmo original
-        """
-        logger.info(f"   Analizando {len(momentos_prometedores)} momentos prometedores...")
-
-        momentos_enraizados = []
-
-        # 🚀 PARALELIZACIÓN: Procesar momentos en paralelo para máxima velocidad
-        logger.info(f"⚡ Procesando {len(momentos_prometedores)} momentos en paralelo...")
-
-        # Determinar número óptimo de workers basado en CPU disponible
-        max_workers = min(4, len(momentos_prometedores))  # Optimizado: 4 workers para mejor eficiencia
+        Cierre de Fase 2: Puntaje Ranking, SCC y orden final
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Crear futuros para todos los momentos
-            futuros = {
-                executor.submit(self._procesar_momento_paralelo, momento): momento
-                for momento in momentos_prometedores
-            }
-
-            # Procesar resultados a medida que se completan
-            progreso_contador = 0
-            total_momentos = len(momentos_prometedores)
-
-            for futuro in concurrent.futures.as_completed(futuros):
-                momento = futuros[futuro]
-                self.calculos_fase_2 += 1
-                progreso_contador += 1
-
-                # Mostrar progreso cada 10 momentos procesados
-                if progreso_contador % 10 == 0 or progreso_contador == total_momentos:
-                    porcentaje = (progreso_contador / total_momentos) * 100
-                    logger.info(f"📊 Progreso Fase 2: {progreso_contador}/{total_momentos} momentos ({porcentaje:.1f}%)")
-
-                try:
-                    resultado = futuro.result()
-                    if resultado:
-                        momentos_enraizados.append(resultado)
-
-                except Exception as e:
-                    logger.warning(f"Error procesando momento {momento}: {e}")
+        Args:
+            momentos_enraizados: Resultados aptos devueltos por los workers
 
-        logger.info(f"✅ Procesamiento paralelo completado: {len(momentos_enraizados)} momentos aptos")
+        Returns:
+            Los MAX_RESULTADOS_FINALES mejores momentos
+        """
+        # Puntaje Ranking de todos los momentos en una sola operación vectorial
+        # (los workers devuelven solo los 5 componentes como floats)
+        if momentos_enraizados:
+            componentes = np.array(
+                [momento.pop('componentes_ranking') for momento in momentos_enraizados], dtype=np.float64
+            )
+            for momento, puntaje in zip(momentos_enraizados, self._puntajes_ranking(componentes).tolist()):
+                momento['puntaje_ranking'] = puntaje
 
         # Aplicar SCC (Score Contextual del Enraizamiento) a todos los momentos
         momentos_con_scc = self._aplicar_scc_a_momentos(momentos_enraizados)
 
-        # Ordenar por SCC (prioridad principal) y puntuación total (desempate)
-        momentos_con_scc.sort(key=lambda x: (x.get('scc', 0), x['puntuacion_total']), reverse=True)
+        # Mejores por SCC (prioridad principal) y puntuación total (desempate).
+        # nlargest equivale a sort(reverse=True)[:K] en O(N log K)
+        mejores = heapq.nlargest(
+            MAX_RESULTADOS_FINALES, momentos_con_scc,
+            key=lambda x: (x.get('scc', 0), x['puntuacion_total'])
+        )
 
         logger.info(f"   Momentos aptos encontrados: {len(momentos_con_scc)}")
-        return momentos_con_scc[:MAX_RESULTADOS_FINALES]  # Retornar directamente los mejores
+        return mejores
 
     def _calcular_enraizamiento_avanzado(self, fecha_hora: datetime) -> float:
         """
@@ -260,77 +448,56 @@ class AlgoritmoBusqueda:
         Calcula la puntuación total combinando enraizamiento y calidad
         Retorna un porcentaje de 0-100% del máximo posible
         """
-        # Enraizamiento: 80% del peso
-        puntos_enraizamiento = score_enraizamiento * 0.8
-        
-        # Calidad del momento: 20% del peso
-        puntos_calidad = 0
-        
-        # Bonus por Luna apta
-        if resultado_luna['apto']:
-            puntos_calidad += 10
-        
-        # Bonus por puntos de Luna
-        puntos_calidad += resultado_luna['puntos_luna'] * 2
-        
-        # Penalización por descalificadores
-        puntos_calidad -= len(resultado_luna['descalificadores']) * 3
-        
-        # Aplicar peso de calidad (20%)
-        puntos_calidad *= 0.2
-        
-        # Calcular puntuación bruta
-        puntuacion_bruta = puntos_enraizamiento + puntos_calidad
-        
-        # Convertir a porcentaje del máximo teórico (0-100%)
-        puntuacion_porcentual = (puntuacion_bruta / PUNTUACION_MAXIMA_TEORICA) * 100
-        
+        # Calidad del momento: bonus por Luna apta y por sus puntos,
+        # penalización por descalificadores
+        puntos_calidad = (
+            (10 if resultado_luna['apto'] else 0)
+            + resultado_luna['puntos_luna'] * 2
+            - len(resultado_luna['descalificadores']) * 3
+        )
+
+        # Enraizamiento 80% + calidad 20%, como porcentaje del máximo teórico
+        # (pesos ya divididos por PUNTUACION_MAXIMA_TEORICA)
+        puntuacion_porcentual = score_enraizamiento * _PESO_ENRAIZAMIENTO_PCT + puntos_calidad * _PESO_CALIDAD_PCT
+
         # Asegurar que esté en rango 0-100
         return max(0, min(100, puntuacion_porcentual))
     
-    def _calcular_puntaje_ranking(self, detalles: Dict) -> float:
+    def _componentes_ranking(self, detalles: Dict) -> Tuple[float, ...]:
         """
-        Calcula el Puntaje Ranking basado en la suma de:
-        - Aptitud de la Luna
-        - Regente del ASC
-        - Regente de la Casa 10
-        - Momentos positivos/negativos
-        
+        Extrae los 5 componentes del Puntaje Ranking (Luna, regente ASC,
+        regente Casa 10, combinaciones positivas y negativas)
+
         Returns:
-            float: Puntaje de ranking para desempate (0-100 escala)
+            Tupla de 5 floats; NaN si no hay detalles de Fase 1 (puntaje 0)
         """
         try:
             fase1_detalles = detalles.get('fase1', {})
             if not fase1_detalles:
-                return 0.0
+                return _COMPONENTES_RANKING_VACIOS
             
             # CORRECCIÓN: Extraer puntos de cada componente desde la estructura correcta
             detalles_fase1 = fase1_detalles.get('detalles', {})
-            puntos_luna = detalles_fase1.get('luna', {}).get('puntos_luna', 0)
-            puntos_asc = detalles_fase1.get('regente_asc', {}).get('puntos_regente_asc', 0)
-            puntos_casa10 = detalles_fase1.get('regente_casa10', {}).get('puntos_regente_casa10', 0)
-            puntos_positivas = detalles_fase1.get('combinaciones_positivas', {}).get('puntos_combinaciones_positivas', 0)
-            puntos_negativas = detalles_fase1.get('combinaciones_negativas', {}).get('puntos_combinaciones_negativas', 0)
-            
-            # Sumar todos los componentes
-            puntaje_total = puntos_luna + puntos_asc + puntos_casa10 + puntos_positivas + puntos_negativas
-            
-            # Normalizar a escala 0-100 (máximo teórico: 32 puntos, mínimo: -2)
-            puntos_maximos = 32.0  # 10+10+6+6 = 32 (corregido con Luna 10 puntos)
-            puntos_minimos = -2.0  # Solo penalizaciones negativas
-            
-            if puntaje_total <= puntos_minimos:
-                return 0.0
-            elif puntaje_total >= puntos_maximos:
-                return 100.0
-            else:
-                # Normalizar al rango 0-100
-                ratio = (puntaje_total - puntos_minimos) / (puntos_maximos - puntos_minimos)
-                return max(0.0, min(100.0, ratio * 100))
+            return (
+                float(detalles_fase1.get('luna', {}).get('puntos_luna', 0)),
+                float(detalles_fase1.get('regente_asc', {}).get('puntos_regente_asc', 0)),
+                float(detalles_fase1.get('regente_casa10', {}).get('puntos_regente_casa10', 0)),
+                float(detalles_fase1.get('combinaciones_positivas', {}).get('puntos_combinaciones_positivas', 0)),
+                float(detalles_fase1.get('combinaciones_negativas', {}).get('puntos_combinaciones_negativas', 0))
+            )
                 
         except Exception as e:
             logger.warning(f"Error calculando puntaje ranking: {e}")
-            return 0.0
+            return _COMPONENTES_RANKING_VACIOS
+
+    @staticmethod
+    def _puntajes_ranking(componentes: np.ndarray) -> np.ndarray:
+        """
+        Normaliza a escala 0-100 la suma de componentes (matriz N x 5)
+        Máximo teórico: 32 puntos, mínimo: -2
+        """
+        puntajes = np.clip((componentes.sum(axis=1) - PUNTOS_RANKING_MINIMOS) * _ESCALA_RANKING, 0.0, 100.0)
+        return np.nan_to_num(puntajes, nan=0.0)
     
     def _calcular_puntuacion_total_combinada(self, enraizamiento_score: float, calidad_score: float) -> float:
         """
@@ -351,40 +518,39 @@ class AlgoritmoBusqueda:
 
         return round(puntuacion_combinada, 2)
 
-    def _eliminar_momentos_cercanos(self, momentos: List[datetime],
-                                   distancia_minima_minutos: int = 240) -> List[datetime]:
+    def _eliminar_momentos_cercanos(self, momentos: np.ndarray,
+                                   distancia_minima_minutos: int = 240) -> np.ndarray:
         """
         Elimina momentos que estén a menos de distancia_minima_minutos entre sí
         para evitar superposiciones de ventanas en Fase 2.
 
         Args:
-            momentos: Lista de momentos a filtrar
+            momentos: Array datetime64 (o secuencia de datetime) de momentos a filtrar
             distancia_minima_minutos: Distancia mínima entre momentos (default: 240 min = 4 horas)
 
         Returns:
-            List[datetime]: Lista filtrada sin momentos demasiado cercanos
+            np.ndarray: Array datetime64[s] ordenado sin momentos demasiado cercanos
         """
-        if not momentos:
-            return momentos
-
         # Ordenar momentos cronológicamente
-        momentos_ordenados = sorted(momentos)
-
-        # Mantener el primer momento
-        momentos_filtrados = [momentos_ordenados[0]]
+        momentos_ordenados = np.sort(np.asarray(momentos, dtype='datetime64[s]'))
+        if not len(momentos_ordenados):
+            return momentos_ordenados
 
-        # Procesar el resto, manteniendo solo aquellos con suficiente distancia
-        for momento in momentos_ordenados[1:]:
-            ultimo_incluido = momentos_filtrados[-1]
+        distancia = np.timedelta64(distancia_minima_minutos, 'm')
 
-            # Calcular diferencia en minutos
-            diferencia_minutos = (momento - ultimo_incluido).total_seconds() / 60
+        # Selección voraz: desde el último incluido, saltar con searchsorted al
+        # primer momento a distancia suficiente (un salto por momento conservado)
+        indices = [0]
+        i = 0
+        while True:
+            i = max(i + 1, int(np.searchsorted(momentos_ordenados, momentos_ordenados[i] + distancia, side='left')))
+            if i >= len(momentos_ordenados):
+                break
+            indices.append(i)
 
-            # Si la diferencia es suficiente, incluir el momento
-            if diferencia_minutos >= distancia_minima_minutos:
-                momentos_filtrados.append(momento)
+        momentos_filtrados = momentos_ordenados[indices]
 
-        logger.debug(f"Filtrado de momentos cercanos: {len(momentos)} -> {len(momentos_filtrados)} "
+        logger.debug(f"Filtrado de momentos cercanos: {len(momentos_ordenados)} -> {len(momentos_filtrados)} "
                     f"(distancia mínima: {distancia_minima_minutos} minutos)")
 
         return momentos_filtrados
@@ -403,35 +569,25 @@ class AlgoritmoBusqueda:
         if not momentos:
             return momentos
 
-        # Crear diccionario para agrupar por tiempo redondeado
-        momentos_por_tiempo = {}
-
-        for momento in momentos:
-            # Redondear tiempo a minutos (ignorar segundos)
-            tiempo_redondeado = momento['fecha_hora'].replace(second=0, microsecond=0)
-
-            # Si ya existe este tiempo, comparar puntuaciones
-            if tiempo_redondeado in momentos_por_tiempo:
-                momento_existente = momentos_por_tiempo[tiempo_redondeado]
-
-                # Comparar por puntuación total primero, luego por enraizamiento
-                puntuacion_nueva = momento.get('puntuacion_total', 0)
-                puntuacion_existente = momento_existente.get('puntuacion_total', 0)
-
-                if puntuacion_nueva > puntuacion_existente:
-                    momentos_por_tiempo[tiempo_redondeado] = momento
-                elif puntuacion_nueva == puntuacion_existente:
-                    # Si puntuaciones iguales, comparar enraizamiento
-                    enraizamiento_nuevo = momento.get('enraizamiento_score', 0)
-                    enraizamiento_existente = momento_existente.get('enraizamiento_score', 0)
-
-                    if enraizamiento_nuevo > enraizamiento_existente:
-                        momentos_por_tiempo[tiempo_redondeado] = momento
-            else:
-                # Primer momento para este tiempo
-                momentos_por_tiempo[tiempo_redondeado] = momento
-
-        momentos_unicos = list(momentos_por_tiempo.values())
+        # Claves de ordenamiento en un DataFrame liviano (los dicts originales no se copian)
+        df = pd.DataFrame({
+            'tiempo': pd.to_datetime([m['fecha_hora'] for m in momentos]).floor('min'),
+            'puntuacion_total': [m.get('puntuacion_total', 0) for m in momentos],
+            'enraizamiento_score': [m.get('enraizamiento_score', 0) for m in momentos],
+        })
+        # Orden de primera aparición de cada minuto (mismo orden que el agrupado original)
+        df['orden'] = df.groupby('tiempo', sort=False).ngroup()
+
+        # Mejor momento por minuto: puntuación total, luego enraizamiento.
+        # El sort estable conserva el primero encontrado ante empates.
+        ganadores = (
+            df.sort_values(['puntuacion_total', 'enraizamiento_score'],
+                           ascending=False, kind='stable')
+              .drop_duplicates('tiempo', keep='first')
+              .sort_values('orden', kind='stable')
+        )
+
+        momentos_unicos = [momentos[i] for i in ganadores.index]
         logger.debug(f"Eliminación de duplicados por tiempo: {len(momentos)} -> {len(momentos_unicos)}")
 
         return momentos_unicos
@@ -475,29 +631,29 @@ class AlgoritmoBusqueda:
             )
 
             if resultado and resultado['apto']:
+                # Cada clave del resultado se lee una sola vez
+                enraizamiento_score = resultado['enraizamiento_score']
+                calidad_score = resultado['calidad_score']
+                detalles = resultado['detalles']
+
                 # Convertir scores a porcentaje para compatibilidad
-                enraizamiento_pct = resultado['enraizamiento_score'] * 100
-                calidad_pct = resultado['calidad_score'] * 100
+                enraizamiento_pct = enraizamiento_score * 100
 
                 if enraizamiento_pct >= UMBRAL_ENRAIZAMIENTO_MINIMO:
-                    # Calcular Puntaje Ranking (calidad del momento para desempate)
-                    puntaje_ranking = self._calcular_puntaje_ranking(resultado['detalles'])
-
-                    # Calcular puntuación total combinada para ranking
-                    puntuacion_total = self._calcular_puntuacion_total_combinada(
-                        resultado['enraizamiento_score'], resultado['calidad_score']
-                    )
-
                     momento_data = {
                         'fecha_hora': momento,
                         'tema_consulta': self.tema_consulta,
-                        'enraizamiento_score': resultado['enraizamiento_score'],
-                        'calidad_score': resultado['calidad_score'],
+                        'enraizamiento_score': enraizamiento_score,
+                        'calidad_score': calidad_score,
                         'enraizamiento_pct': enraizamiento_pct,
-                        'calidad_pct': calidad_pct,
-                        'puntaje_ranking': puntaje_ranking,
-                        'puntuacion_total': puntuacion_total,
-                        'detalles': resultado['detalles']
+                        'calidad_pct': calidad_score * 100,
+                        # Componentes del Puntaje Ranking (se normalizan en lote al final de Fase 2)
+                        'componentes_ranking': self._componentes_ranking(detalles),
+                        # Puntuación total combinada para ranking
+                        'puntuacion_total': self._calcular_puntuacion_total_combinada(
+                            enraizamiento_score, calidad_score
+                        ),
+                        'detalles': detalles
                     }
                     return momento_data
 
@@ -514,7 +670,7 @@ def procesar_momento_fase1_estatico(momento: datetime, lat: float, lon: float) -
     """
     try:
         # Crear wrapper para evaluación rápida
-        wrapper = LegacyAstroWrapper(momento, lat, lon)
+        wrapper = get_wrapper(momento, lat, lon)
 
         # Solo verificar descalificadores críticos (muy rápido)
         es_descalificado, razon = wrapper.es_momento_critico_descalificado()
@@ -527,6 +683,43 @@ def procesar_momento_fase1_estatico(momento: datetime, lat: float, lon: float) -
         return True
 
 
+def evaluar_momento_fase1_estatico(momento: datetime, lat: float, lon: float) -> Tuple[datetime, bool]:
+    """
+    Variante de Fase 1 para imap_unordered: devuelve (momento, es_apto), así
+    el resultado identifica al momento sin importar el orden y puede cachearse
+    """
+    return momento, procesar_momento_fase1_estatico(momento, lat, lon)
+
+
+# Instancia de AlgoritmoBusqueda propia de cada proceso worker de Fase 2
+_algoritmo_worker = None
+
+
+def _init_worker_fase2(carta_natal_A: Dict, tema_consulta: str, lat: float, lon: float):
+    """
+    Initializer del ProcessPoolExecutor de Fase 2
+    Construye el algoritmo (y su EnraizamientoCalculator) una vez por proceso
+    y deja calculada la carta natal A antes de recibir tareas
+    """
+    global _algoritmo_worker
+    _algoritmo_worker = AlgoritmoBusqueda(carta_natal_A, tema_consulta, lat, lon)
+
+    # La carta A se cachea en el calculador; si falla acá, se reintenta en
+    # la primera tarea y el error queda registrado por momento como antes
+    try:
+        _algoritmo_worker.enraizamiento_calc._get_carta_natal()
+    except Exception as e:
+        logger.warning(f"Carta natal A no precalculada en worker {os.getpid()}: {e}")
+
+
+def procesar_momento_fase2_estatico(momento: datetime) -> Dict:
+    """
+    Función estática para multiprocessing - Fase 2
+    Solo recibe el momento; el resto del contexto vive en el worker
+    """
+    return _algoritmo_worker._procesar_momento_paralelo(momento)
+
+
 def generar_rango_fechas(fecha_inicio: datetime, dias: int = 365) -> datetime:
     """
     Genera fecha de fin basada en fecha de inicio y número de días
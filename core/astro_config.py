@@ -1,6 +1,8 @@
 
 from typing import Dict, List
 
+import numpy as np
+
 class AstroConfig:
     """
     Configuración centralizada para el motor astrológico.
@@ -17,12 +19,22 @@ class AstroConfig:
         "SQUARE": 8.0,
         "SEXTILE": 6.0
     }
+
+    # Tabla ángulo -> orbe (construida una vez al definir la clase)
+    _ORB_BY_ANGLE: Dict[float, float] = {
+        0: ORB_ASPECTS["CONJUNCTION"],
+        180: ORB_ASPECTS["OPPOSITION"],
+        120: ORB_ASPECTS["TRINE"],
+        90: ORB_ASPECTS["SQUARE"],
+        60: ORB_ASPECTS["SEXTILE"]
+    }
     
     # Orbe para Fase Lunar (Nueva/Llena)
     ORB_MOON_PHASE: float = 8.0
     
     # Aspectos considerados "Mayores" (Ptolomeicos)
     MAJOR_ASPECTS: List[int] = [0, 60, 90, 120, 180]
+    MAJOR_ASPECTS_NP: np.ndarray = np.array(MAJOR_ASPECTS, dtype=np.int16)  # Para broadcasting
     
     # Planetas considerados para "Vacío de Curso"
     # Tradicionalmente: Sol, Mer, Ven, Mar, Jup, Sat
@@ -42,9 +54,4 @@ class AstroConfig:
     @classmethod
     def get_orb(cls, aspect_angle: float) -> float:
         """Devuelve el orbe apropiado para un ángulo dado."""
-        if aspect_angle == 0: return cls.ORB_ASPECTS["CONJUNCTION"]
-        if aspect_angle == 180: return cls.ORB_ASPECTS["OPPOSITION"]
-        if aspect_angle == 120: return cls.ORB_ASPECTS["TRINE"]
-        if aspect_angle == 90: return cls.ORB_ASPECTS["SQUARE"]
-        if aspect_angle == 60: return cls.ORB_ASPECTS["SEXTILE"]
-        return 1.0 # Default fallback
+        return cls._ORB_BY_ANGLE.get(aspect_angle, 1.0) # 1.0: Default fallback
@@ -1,20 +1,79 @@
 
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Dict, Optional
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from .vectorized_ephemeris import VectorizedEphemeris
-from .vectorized_logic import VectorizedLogic
+from .vectorized_logic import VectorizedLogic, SIGN_TO_RULER, angular_dist
 from .vectorized_houses import VectorizedHouses
 from .vectorized_natal import VectorizedNatal
 from .astro_config import AstroConfig
 from .theme_config import get_theme_config, THEMES
+from .vectorized_scoring import SCORE_DTYPE
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+# Normalización UX: máximos de referencia de cada componente
+MAX_SCORE_GENERAL = 30.0 # General Max ~30 pts (Excellent)
+MAX_SCORE_NATAL = 10.0   # Natal Max ~10 pts (Perfect Link)
+
+# Etiquetas semánticas por puntaje híbrido (umbrales 20/40/60/80 -> 1-5 estrellas)
+SCORE_THRESHOLDS = np.array([20.0, 40.0, 60.0, 80.0])
+SCORE_LABELS = np.array(["Pobre", "Regular", "Bueno", "Muy Bueno", "Excelente"])
+
+# Cuerpos calculados por búsqueda (Sol..Saturno + 10=MeanNode); las matrices
+# de longitudes/velocidades se indexan directamente por estos IDs
+BODIES = (0, 1, 2, 3, 4, 5, 6, 10)
+
+# Motivos de rechazo, en el orden en que se apilan las máscaras de filtro
+REJECT_NAMES = ["moon", "ruler", "natal", "malefic_angle"]
+
+# Pool de hilos compartido para los scorers (se crea al primer uso)
+SCORING_MAX_WORKERS = 5
+_scoring_pool: Optional[ThreadPoolExecutor] = None
+_scoring_pool_lock = threading.Lock()
+
+
+def _get_scoring_pool() -> ThreadPoolExecutor:
+    global _scoring_pool
+    if _scoring_pool is None:
+        with _scoring_pool_lock:
+            if _scoring_pool is None:
+                _scoring_pool = ThreadPoolExecutor(
+                    max_workers=SCORING_MAX_WORKERS, thread_name_prefix="scoring"
+                )
+    return _scoring_pool
+
+
+def _finalize_scores(s_general: np.ndarray, s_natal: np.ndarray):
+    """
+    Normaliza General/Natal a 0-100, combina 70% Cielo / 30% Natal y asigna
+    1-5 estrellas por umbral. Opera en buffers propios (out=) para no
+    generar un temporal por cada paso. Los porcentajes se calculan en float64
+    aunque los puntajes lleguen en float32.
+    """
+    norm_gen = np.divide(s_general, MAX_SCORE_GENERAL, dtype=np.float64)
+    np.multiply(norm_gen, 100.0, out=norm_gen)
+    np.clip(norm_gen, 0.0, 100.0, out=norm_gen)
+
+    norm_nat = np.divide(s_natal, MAX_SCORE_NATAL, dtype=np.float64)
+    np.multiply(norm_nat, 100.0, out=norm_nat)
+    np.clip(norm_nat, 0.0, 100.0, out=norm_nat)
+
+    # Client Request: 70% Heaven, 30% Personal
+    score_hybrid = np.multiply(norm_gen, 0.70)
+    score_hybrid += norm_nat * 0.30
+
+    # Rango por umbral sin ramas: x >= 20/40/60/80 -> 2/3/4/5 estrellas
+    stars = np.searchsorted(SCORE_THRESHOLDS, score_hybrid, side='right') + 1
+    return score_hybrid, norm_gen, norm_nat, stars
+
+
 class VectorizedElectionFinder:
     """
     Motor de Búsqueda Vectorizado Integrado V2.
@@ -63,19 +122,20 @@ class VectorizedElectionFinder:
         # 0. Configuración del Tema
         config = get_theme_config(topic)
         
-        # 1. Generar grilla de tiempo (Time Grid)
+        # 1. Generar grilla de tiempo (Time Grid) como datetime64, sin objetos datetime
+        # (hora de pared: una zona horaria en start_dt se ignora, como antes)
         total_time = end_dt - start_dt
         total_intervals = int(total_time.total_seconds() / (interval_minutes * 60))
-        timestamps = [start_dt + timedelta(minutes=i*interval_minutes) for i in range(total_intervals)]
-        times_arr = np.array(timestamps)
+        start64 = np.datetime64(start_dt.replace(tzinfo=None), 's')
+        times_arr = start64 + np.arange(total_intervals) * np.timedelta64(interval_minutes, 'm')
         
         logger.info(f"⚡ Analizando {len(times_arr)} momentos...")
         
         # 2. Calcular Posiciones (Fase Física)
-        bodies = [0, 1, 2, 3, 4, 5, 6, 10] # 10=MeanNode
-        positions = self.ephemeris.calculate_positions(times_arr, bodies)
-        longitudes = self.ephemeris.get_longitudes(positions)
-        speeds = self.ephemeris.get_speeds(positions)
+        positions = self.ephemeris.calculate_positions(times_arr, BODIES)
+        # Matrices (max_id+1, N) indexadas por ID de cuerpo: longitudes[pid] es la fila del cuerpo
+        longitudes = self.ephemeris.get_longitude_matrix(positions)
+        speeds = self.ephemeris.get_speed_matrix(positions)
         
         # 3. Calcular Casas y Regencias (Toposcopía)
         cusps, ascmc = self.houses.calculate_houses(times_arr, lat, lon)
@@ -104,36 +164,27 @@ class VectorizedElectionFinder:
         # Cúspide de la Casa X (indices 0-11, house 10 -> index 9)
         cusp_longs = cusps[:, target_house - 1]
         
-        # Signo de esa Cúspide
-        cusp_signs = self.logic.get_sign_indices(cusp_longs)
+        # Signo de esa Cúspide (0-11, int8 para indexar tablas)
+        cusp_signs = np.floor_divide(cusp_longs, 30.0).astype(np.int8)
         
         # Regente de ese Signo
-        # Esto es más complejo vectorialmente porque cada momento puede tener diferente regente.
-        # Solución: Iterar sobre los 12 signos posibles.
-        
-        is_bad_ruler = np.zeros(len(times_arr), dtype=bool)
-        
-        for sign_idx in range(12):
-            # Máscara de momentos donde la cúspide cae en este signo
-            mask_times = (cusp_signs == sign_idx)
-            if not np.any(mask_times): continue
-            
-            # Quién rige este signo?
-            ruler_id = self.logic.get_ruler_for_sign(sign_idx)
-            
-            # Longitud y Velocidad de ese regente
-            ruler_longs = longitudes[ruler_id][mask_times]
-            ruler_speeds_local = speeds[ruler_id][mask_times]
-            
-            # Chequear Debilidad (Exilio/Caída)
-            debility_local = self.logic.mask_debility(ruler_id, ruler_longs)
-            
-            # Chequear Retrogradación (Velocidad < 0)
-            # Rule: "el regente del ASC esta retrogrado -> No apto" (and H10 rules too)
-            retro_local = (ruler_speeds_local < 0)
-            
-            # Asignar resultado (Debilidad OR Retrogradación)
-            is_bad_ruler[mask_times] = debility_local | retro_local
+        # Cada momento puede tener diferente regente: tabla SIGN_TO_RULER
+        # y un solo gather (fila = regente, columna = momento) sobre matrices
+        # de longitudes/velocidades de los regentes posibles (Sol..Saturno).
+        moment_cols = np.arange(len(times_arr))
+        ruler_longs_2d = longitudes[:7]
+        ruler_speeds_2d = speeds[:7]
+        
+        ruler_h10_ids = SIGN_TO_RULER[cusp_signs]
+        ruler_h10_longs = ruler_longs_2d[ruler_h10_ids, moment_cols]
+        ruler_h10_speeds = ruler_speeds_2d[ruler_h10_ids, moment_cols]
+        
+        # Chequear Retrogradación (Velocidad < 0)
+        # Rule: "el regente del ASC esta retrogrado -> No apto" (and H10 rules too)
+        is_bad_ruler = (ruler_h10_speeds < 0)
+        
+        # Chequear Debilidad (Exilio/Caída): un gather (regente, signo) por momento
+        is_bad_ruler |= self.logic.mask_debility(ruler_h10_ids, ruler_h10_longs)
             
         # 6. Fase Lógica - Filtros Natales (Enraizamiento)
         is_bad_natal = np.zeros(len(times_arr), dtype=bool)
@@ -144,26 +195,21 @@ class VectorizedElectionFinder:
         # but VectorizedHouses returns cusps and ascmc separately.
         # Let's assume ascmc_arr contains [Asc, MC].
         
-        # Get Angles
+        # Get Angles (4, N): Asc, MC, Dsc, IC
         asc_arr = ascmc[:, 0]
         mc_arr = ascmc[:, 1]
-        dsc_arr = (asc_arr + 180) % 360
-        ic_arr = (mc_arr + 180) % 360
+        angles = np.empty((4, len(times_arr)))
+        angles[0] = asc_arr
+        angles[1] = mc_arr
+        np.add(angles[:2], 180.0, out=angles[2:])
+        np.mod(angles[2:], 360.0, out=angles[2:])
         
-        angles = [asc_arr, mc_arr, dsc_arr, ic_arr]
-        malefics = [4, 6] # Mars, Saturn
+        malefics = longitudes[[4, 6]] # (2, N) Mars, Saturn
         orb_angle = 5.0
         
-        is_malefic_on_angle = np.zeros(len(times_arr), dtype=bool)
-        
-        for malefic_id in malefics:
-            malefic_pos = longitudes[malefic_id]
-            for angle in angles:
-                # Check conjunction
-                diff = np.abs(malefic_pos - angle)
-                diff = np.minimum(diff, 360 - diff)
-                mask_conj = diff <= orb_angle
-                is_malefic_on_angle |= mask_conj
+        # Check conjunction: todos los pares maléfico/ángulo en un solo broadcast (2, 4, N)
+        diff = angular_dist(malefics[:, np.newaxis, :], angles[np.newaxis, :, :])
+        is_malefic_on_angle = (diff <= orb_angle).any(axis=(0, 1))
                 
         # This is strictly part of "Enraizamiento" section in CSV, likely meaning "The Rooted Chart Rules"
         # We add it to the 'rejected' mask
@@ -181,94 +227,99 @@ class VectorizedElectionFinder:
              is_bad_natal = np.zeros(len(times_arr), dtype=bool) # All False (No hard aspects detected/blocked)
              
         # 7. Combinar Todos los Filtros
-        is_rejected = is_bad_moon | is_bad_ruler | is_bad_natal | is_malefic_on_angle
+        # Máscaras apiladas (R, N) en el orden de REJECT_NAMES: una sola reducción
+        # y, de paso, el motivo de rechazo de cada momento
+        reject_masks = np.stack([is_bad_moon, is_bad_ruler, is_bad_natal, is_malefic_on_angle])
+        is_rejected = reject_masks.any(axis=0)
         is_valid = ~is_rejected
         
-        # 8. Construir Resultados
-        valid_indices = np.where(is_valid)[0]
+        # 8. Construir Resultados (índices válidos: una sola pasada, reutilizada en el scoring)
+        valid_indices = np.flatnonzero(is_valid)
         
         logger.info(f"✨ Encontrados {len(valid_indices)} momentos candidatos ({len(valid_indices)/len(times_arr)*100:.1f}%)")
         
         # --- 8. SCORING VECTORIZADO ---
-        # Calculamos score para TODOS los momentos (vectorización es eficiente)
-        # O solo para válidos para ahorrar? Pero necesito masking.
-        # Mejor calcular para todos y luego filtrar.
+        # Con return_all=True se puntúan todos los momentos (modo debug).
+        # Si no, solo los que sobreviven a los filtros: el trabajo de scoring
+        # es proporcional a los candidatos válidos, no a la grilla completa.
+        # (slice(None) devuelve vistas, sin copiar los arrays)
+        sel = slice(None) if return_all else valid_indices
         
         # A. Preparar datos de Rulers (IDs y Longitudes)
         # Necesitamos arrays (N,) para IDs y Posiciones de Regente ASC y H10
-        
-        ruler_asc_ids = np.zeros(len(times_arr), dtype=int)
-        ruler_asc_longs = np.zeros(len(times_arr), dtype=float)
-        ruler_asc_speeds = np.zeros(len(times_arr), dtype=float)
+        # (H10 = 'cusp_signs' de target_house, ya resuelto en el paso 5)
         
         # Obtener Signos Asc
-        asc_signs = self.logic.get_sign_indices(asc_arr)
-        
-        # Populate arrays
-        for sign_idx in range(12):
-            mask = (asc_signs == sign_idx)
-            if not np.any(mask): continue
-            pid = self.logic.get_ruler_for_sign(sign_idx)
-            ruler_asc_ids[mask] = pid
-            ruler_asc_longs[mask] = longitudes[pid][mask]
-            ruler_asc_speeds[mask] = speeds[pid][mask]
-            
-        # Same for H10
-        # Wait, I already calculated 'cusp_signs' (H10 sign) at lines 99
-        # 'cusp_signs' corresponds to target_house (H10 default)
-        ruler_h10_ids = np.zeros(len(times_arr), dtype=int)
-        ruler_h10_longs = np.zeros(len(times_arr), dtype=float)
-        ruler_h10_speeds = np.zeros(len(times_arr), dtype=float)
-        
-        for sign_idx in range(12):
-            mask = (cusp_signs == sign_idx)
-            if not np.any(mask): continue
-            pid = self.logic.get_ruler_for_sign(sign_idx)
-            ruler_h10_ids[mask] = pid
-            ruler_h10_longs[mask] = longitudes[pid][mask]
-            ruler_h10_speeds[mask] = speeds[pid][mask]
-
-        # Necesitamos Planet Longs como Dict para el Scorer
-        planet_longs_dict = {pid: longitudes[pid] for pid in bodies}
+        asc_signs = np.floor_divide(asc_arr, 30.0).astype(np.int8)
         
+        ruler_asc_ids = SIGN_TO_RULER[asc_signs]
+        ruler_asc_longs = ruler_longs_2d[ruler_asc_ids, moment_cols]
+        ruler_asc_speeds = ruler_speeds_2d[ruler_asc_ids, moment_cols]
+
+        # Arrays de entrada del scoring restringidos a los momentos seleccionados
+        s_times = times_arr[sel]
+        s_moon_longs = moon_longs[sel]
+        s_sun_longs = sun_longs[sel]
+        s_longitudes = longitudes[:, sel]
+        s_cusps = cusps[sel]
+        s_ascmc = ascmc[sel]
+
         # B. Calcular Scores
         
+        s_ruler_asc_ids, s_ruler_asc_longs = ruler_asc_ids[sel], ruler_asc_longs[sel]
+        s_ruler_h10_ids, s_ruler_h10_longs = ruler_h10_ids[sel], ruler_h10_longs[sel]
+
+        # Try to infer Natal ASC Sign from natal_chart if stored (e.g. key 'asc' or 15)
+        # For this context, we might not have it unless passed.
+        # Assuming safe default (None -> Apply strict penalties).
+        natal_asc_sign = None 
+        # Ideally we should get this from input, but let's check if key 100 or similar exists?
+        # No convention yet.
+
+        # Los cinco scorers son independientes entre sí (solo leen los arrays de
+        # entrada): se lanzan en paralelo en el pool compartido, NumPy libera el GIL
+        pool = _get_scoring_pool()
+
         # 1. MOON SCORE
-        score_moon, details_moon = self.scorer.calculate_moon_score(
-            times_arr, moon_longs, sun_longs, planet_longs_dict, cusps, ascmc
+        f_moon = pool.submit(
+            self.scorer.calculate_moon_score,
+            s_times, s_moon_longs, s_sun_longs, s_longitudes, s_cusps, s_ascmc
         )
         
         # 2. RULER ASC SCORE
-        score_r_asc, details_r_asc = self.scorer.calculate_ruler_score(
-            times_arr, 'ASC', ruler_asc_longs, ruler_asc_ids, sun_longs, planet_longs_dict, cusps, ruler_asc_speeds
+        f_r_asc = pool.submit(
+            self.scorer.calculate_ruler_score,
+            s_times, 'ASC', s_ruler_asc_longs, s_ruler_asc_ids, s_sun_longs, s_longitudes, s_cusps, ruler_asc_speeds[sel]
         )
         
         # 3. RULER H10 SCORE
-        score_r_h10, details_r_h10 = self.scorer.calculate_ruler_score(
-            times_arr, 'H10', ruler_h10_longs, ruler_h10_ids, sun_longs, planet_longs_dict, cusps, ruler_h10_speeds
+        f_r_h10 = pool.submit(
+            self.scorer.calculate_ruler_score,
+            s_times, 'H10', s_ruler_h10_longs, s_ruler_h10_ids, s_sun_longs, s_longitudes, s_cusps, ruler_h10_speeds[sel]
         )
 
         # 4. NATAL SCORE (Enraizamiento)
-        score_natal, details_natal = self.scorer.calculate_natal_score(
-            times_arr, ascmc, cusps, natal_chart
+        f_natal = pool.submit(
+            self.scorer.calculate_natal_score,
+            s_times, s_ascmc, s_cusps, natal_chart
         )
 
         # 5. COMBINATIONS SCORE (Pos/Neg - Arquetipos)
-        # Try to infer Natal ASC Sign from natal_chart if stored (e.g. key 'asc' or 15)
-        # For this context, we might not have it unless passed.
-        # Assuming safe default (None -> Apply strict penalties).
-        natal_asc_sign = None 
-        # Ideally we should get this from input, but let's check if key 100 or similar exists?
-        # No convention yet.
-        
-        score_comb, details_comb = self.scorer.calculate_combinations_score(
-             times_arr,
-             ruler_asc_ids, ruler_asc_longs,
-             ruler_h10_ids, ruler_h10_longs,
-             planet_longs_dict,
-             ascmc, cusps,
+        f_comb = pool.submit(
+             self.scorer.calculate_combinations_score,
+             s_times,
+             s_ruler_asc_ids, s_ruler_asc_longs,
+             s_ruler_h10_ids, s_ruler_h10_longs,
+             s_longitudes,
+             s_ascmc, s_cusps,
              natal_asc_sign
         )
+
+        score_moon, details_moon = f_moon.result()
+        score_r_asc, details_r_asc = f_r_asc.result()
+        score_r_h10, details_r_h10 = f_r_h10.result()
+        score_natal, details_natal = f_natal.result()
+        score_comb, details_comb = f_comb.result()
         
         # TOTAL SCORE
         total_score = score_moon + score_r_asc + score_r_h10 + score_natal + score_comb
@@ -287,118 +338,80 @@ class VectorizedElectionFinder:
         # score_positive = Sum of all components > 0
         # score_negative = Sum of all components < 0
         
-        score_positive = np.zeros(len(times_arr))
-        score_negative = np.zeros(len(times_arr))
-        
-        for key, arr in all_details.items():
-            score_positive += np.maximum(arr, 0.0)
-            score_negative += np.minimum(arr, 0.0)
+        # Detalles apilados una sola vez (K, V), V = momentos puntuados (solo los
+        # válidos salvo return_all): sirven para la suma Pos/Neg y para los
+        # componentes por momento, sin trabajo sobre los rechazados
+        detail_keys = list(all_details.keys())
+        details_matrix = np.stack([all_details[k] for k in detail_keys], dtype=SCORE_DTYPE)
+        # details_matrix ya es dueño de los datos: se sueltan los arrays por componente
+        for details in (all_details, details_moon, details_r_asc, details_r_h10, details_natal, details_comb):
+            details.clear()
+        
+        # Un único buffer (K, V) reutilizado para la parte positiva y la negativa
+        scratch = np.maximum(details_matrix, 0.0)
+        score_positive = scratch.sum(axis=0)
+        np.minimum(details_matrix, 0.0, out=scratch)
+        score_negative = scratch.sum(axis=0)
             
         # Re-verify total score consistency (Optional but good for sanity)
         # total_check = score_positive + score_negative
         # assert np.allclose(total_score, total_check), "Score mismatch!"
 
-        if return_all:
-             indices_to_process = np.arange(len(times_arr))
-        else:
-             indices_to_process = np.where(~is_rejected)[0]
-             
-        results = []
-        for idx in indices_to_process:
-            # If not return_all (strict) and rejected, we skip (handled by indices_to_process)
-            # If return_all=True, we process everyone.
-            
-            is_valid_moment = not is_rejected[idx]
-            
-            t = times_arr[idx]
-            moon_sign_idx = int(moon_longs[idx] // 30)
-            
-            # Extract components for this specific moment (for Tooltip)
-            # We filter only non-zero components to save bandwidth
-            components = {}
-            for k, v in all_details.items():
-                val = v[idx]
-                if abs(val) > 0.001:
-                    components[k] = val
-                    
-            # -------------------------------------------------------------
-            # UX Normalization (70% Heaven / 30% Natal)
-            # -------------------------------------------------------------
-            
-            # 1. Separate Scores
-            s_natal = score_natal[idx]
-            s_general = total_score[idx] - s_natal # "Heaven" Score
-            
-            # 2. Independent Normalization
-            # General Max ~30 pts (Excellent)
-            # Natal Max ~10 pts (Perfect Link)
-            MAX_GEN = 30.0
-            MAX_NAT = 10.0
-            
-            norm_gen = (s_general / MAX_GEN) * 100.0
-            norm_gen = min(max(norm_gen, 0.0), 100.0)
-            
-            norm_nat = (s_natal / MAX_NAT) * 100.0
-            norm_nat = min(max(norm_nat, 0.0), 100.0)
+        # Los scores ya están restringidos a `sel`; el resto de columnas se
+        # recortan igual (si return_all=True, se incluyen los rechazados)
+        is_valid_v = is_valid[sel]
+        
+        # -------------------------------------------------------------
+        # UX Normalization (70% Heaven / 30% Natal)
+        # -------------------------------------------------------------
+        
+        # 1. Separate Scores
+        s_natal = score_natal
+        s_general = total_score - s_natal # "Heaven" Score
+        
+        # 2-4. Normalización independiente, híbrido 70/30 y estrellas
+        score_hybrid, norm_gen, norm_nat, stars = _finalize_scores(s_general, s_natal)
+        labels = SCORE_LABELS[stars - 1].tolist()
+        
+        # Extract components per moment (for Tooltip)
+        # We filter only non-zero components to save bandwidth
+        nonzero = np.abs(details_matrix) > 0.001
+        components = [
+            {detail_keys[k]: column[k] for k in np.flatnonzero(column_nonzero)}
+            for column, column_nonzero in zip(details_matrix.T, nonzero.T)
+        ]
+        
+        # Collect Rejection Flags (if any): nombre de cada filtro que rechazó el momento
+        reasons_v = reject_masks[:, sel]  # (R, V)
+        flags = [[REJECT_NAMES[r] for r in np.flatnonzero(column)] for column in reasons_v.T]
+        
+        return pd.DataFrame({
+            "timestamp": s_times.astype('datetime64[ns]'),
+            "is_valid": is_valid_v,
+            "flags": flags,
+            "moon_sign": (s_moon_longs // 30).astype(int),
             
-            # 3. Hybrid Weighted Score
-            # Client Request: 70% Heaven, 30% Personal
-            score_hybrid = (norm_gen * 0.70) + (norm_nat * 0.30)
+            # Raw Data (for Debug/Graphs)
+            "score_total": total_score, # Legacy Total
+            "score_general": s_general,      # Heaven Only
+            "score_natal": s_natal,          # Earth Only
             
-            # 4. Semantic Labeling (Based on Hybrid)
-            if score_hybrid >= 80:
-                label = "Excelente"
-                stars = 5
-            elif score_hybrid >= 60:
-                label = "Muy Bueno"
-                stars = 4
-            elif score_hybrid >= 40:
-                label = "Bueno"
-                stars = 3
-            elif score_hybrid >= 20:
-                label = "Regular"
-                stars = 2
-            else:
-                label = "Pobre"
-                stars = 1
+            "score_positive": score_positive,
+            "score_negative": score_negative,
             
-            # Collect Rejection Flags (if any)
-            flags = []
-            if not is_valid_moment:
-                 flags.append("rejected")
-                 # We could add detailed reasons if we stored separate masks
-                 # e.g. "moon_voc", "saturn_on_angle".
-                 # For now, generic rejected.
+            # User Facing Data (for UI Cards)
+            "score_normalized": np.round(score_hybrid, 1), # The Big Number (0-100)
+            "norm_general": np.round(norm_gen, 1),         # Sub-bar 1 (0-100)
+            "norm_natal": np.round(norm_nat, 1),           # Sub-bar 2 (0-100)
             
-            results.append({
-                "timestamp": t,
-                "is_valid": bool(is_valid_moment),
-                "flags": flags,
-                "moon_sign": moon_sign_idx,
-                
-                # Raw Data (for Debug/Graphs)
-                "score_total": total_score[idx], # Legacy Total
-                "score_general": s_general,      # Heaven Only
-                "score_natal": s_natal,          # Earth Only
-                
-                "score_positive": score_positive[idx],
-                "score_negative": score_negative[idx],
-                
-                # User Facing Data (for UI Cards)
-                "score_normalized": round(score_hybrid, 1), # The Big Number (0-100)
-                "norm_general": round(norm_gen, 1),         # Sub-bar 1 (0-100)
-                "norm_natal": round(norm_nat, 1),           # Sub-bar 2 (0-100)
-                
-                "label": label,
-                "stars": stars,
-                
-                # Breakdown for Tooltip
-                "score_moon": score_moon[idx],
-                "score_r_asc": score_r_asc[idx],
-                "score_r_h10": score_r_h10[idx],
-                # score_natal is already above
-                "score_comb": score_comb[idx],
-                "components": components 
-            })
+            "label": labels,
+            "stars": stars,
             
-        return pd.DataFrame(results)
+            # Breakdown for Tooltip
+            "score_moon": score_moon,
+            "score_r_asc": score_r_asc,
+            "score_r_h10": score_r_h10,
+            # score_natal is already above
+            "score_comb": score_comb,
+            "components": components
+        })
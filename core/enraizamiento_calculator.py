@@ -6,22 +6,86 @@ Generates variable scores from 25%-95% based on actual astrological factors
 
 import sys
 import os
-import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 from functools import lru_cache
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+_RAIZ_PROYECTO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _RAIZ_PROYECTO not in sys.path:
+    sys.path.append(_RAIZ_PROYECTO)
 
 from immanuel import charts
 from immanuel.const import chart, dignities
-from immanuel.classes.serialize import ToJSON
 from legacy_astro.settings_astro import astro_avanzada_settings
+from legacy_astro.chart_cache import natal_cacheado, cuantizar_momento
 from config.settings import ENRAIZAMIENTO_WEIGHTS, ORBE_CONJUNCION, ORBE_TRIGONO_SEXTIL, ORBE_CUADRATURA_OPOSICION
 
 logger = logging.getLogger(__name__)
 
+# Configurar immanuel una vez por proceso (como los módulos legacy_astro)
+astro_avanzada_settings()
+
+# Aspectos (nombre, ángulo exacto, orbe máximo) que _calcular_aspecto evalúa
+# en orden de prioridad
+_ASPECTOS = (
+    ('conjuncion', 0, ORBE_CONJUNCION),
+    ('sextil', 60, ORBE_TRIGONO_SEXTIL),
+    ('cuadratura', 90, ORBE_CUADRATURA_OPOSICION),
+    ('trigono', 120, ORBE_TRIGONO_SEXTIL),
+    ('oposicion', 180, ORBE_CUADRATURA_OPOSICION)
+)
+
+# Ids immanuel de las casas (número -> clave str de casa_longs)
+_CASA_IDS = {numero: str(2000000 + numero) for numero in range(1, 13)}
+
+
+def _carta_a_dict(natal) -> Dict:
+    """
+    Extrae de una carta immanuel solo lo que usa el análisis, leyendo los
+    atributos directamente (sin round-trip JSON). Claves str como en el JSON.
+    """
+    asc = natal.objects[chart.ASC]
+    return {
+        'asc_grados': asc.longitude.raw,
+        'asc_signo': asc.sign.number,
+        'planeta_longs': {str(pid): obj.longitude.raw for pid, obj in natal.objects.items()},
+        'casa_longs': {str(cid): casa.longitude.raw for cid, casa in natal.houses.items()}
+    }
+
+
+def _carta_plana_desde_json(carta: Dict) -> Dict:
+    """Mismo formato que _carta_a_dict a partir de una carta ya serializada (legacy)"""
+    return {
+        'asc_grados': carta['asc_grados'],
+        'asc_signo': carta['asc_signo'],
+        'planeta_longs': {pid: obj['longitude']['raw'] for pid, obj in carta['planetas'].items()},
+        'casa_longs': {cid: casa['longitude']['raw'] for cid, casa in carta['casas'].items()}
+    }
+
+
+@lru_cache(maxsize=4096)
+def _calcular_carta_electiva(momento_electivo: datetime, lat_q: int, lon_q: int) -> Dict:
+    """
+    Carta del momento electivo B(n), cacheada para todo el proceso por momento
+    y lugar cuantizados (0.1 s de hora local y 1e-4°, igual que la carta del
+    legacy_wrapper). El dict es compartido por el cache: no modificarlo.
+    """
+    try:
+        # Carta electiva (compartida con los módulos legacy del mismo momento)
+        natal = natal_cacheado(momento_electivo, lat_q / 1e4, lon_q / 1e4)
+
+        # Extraer posiciones para el análisis; '_houses' es lo que usa de B(n)
+        # el enraizamiento original (Fase 2), así no vuelve a armar la carta
+        carta_data = _carta_a_dict(natal)
+        carta_data['_houses'] = natal._houses
+        return carta_data
+
+    except Exception as e:
+        logger.error(f"Error calculando carta electiva B(n): {e}")
+        raise
+
+
 class EnraizamientoCalculator:
     """
     Calculadora avanzada de enraizamiento que analiza conexiones reales
@@ -37,13 +101,11 @@ class EnraizamientoCalculator:
         """
         self.datos_natales = datos_natales
         self._carta_natal_cache = None
-        
-        # Configurar immanuel
-        astro_avanzada_settings()
+        self._original_calc = None
         
         # Si ya tenemos los datos de carta calculados, usarlos directamente
         if self._es_formato_legacy(datos_natales):
-            self._carta_natal_cache = datos_natales
+            self._carta_natal_cache = _carta_plana_desde_json(datos_natales)
             logger.debug("Usando datos de carta natal en formato legacy")
     
     def _es_formato_legacy(self, datos: Dict) -> bool:
@@ -54,11 +116,10 @@ class EnraizamientoCalculator:
         # Formato nuevo tiene 'fecha_nacimiento', 'lat_nacimiento', 'lon_nacimiento'
         return 'planetas' in datos and 'casas' in datos and 'asc_grados' in datos
         
-    @lru_cache(maxsize=1)
     def _get_carta_natal(self) -> Dict:
         """
         Obtiene y cachea la carta natal base (Carta A)
-        Se calcula una sola vez por sesión para optimizar performance
+        Se calcula una sola vez por instancia (queda en self._carta_natal_cache)
         """
         if self._carta_natal_cache is not None:
             return self._carta_natal_cache
@@ -72,14 +133,8 @@ class EnraizamientoCalculator:
             subject = charts.Subject(fecha_nacimiento, lat, lon)
             natal = charts.Natal(subject)
             
-            # Convertir a JSON para facilitar análisis
-            carta_data = {
-                'planetas': json.loads(json.dumps(natal.objects, cls=ToJSON, indent=4)),
-                'casas': json.loads(json.dumps(natal.houses, cls=ToJSON, indent=4)),
-                'aspectos': json.loads(json.dumps(natal.aspects, cls=ToJSON, indent=4)),
-                'asc_grados': json.loads(json.dumps(natal.objects, cls=ToJSON))["3000001"]["longitude"]["raw"],
-                'asc_signo': json.loads(json.dumps(natal.objects, cls=ToJSON))["3000001"]["sign"]["number"]
-            }
+            # Extraer posiciones para el análisis
+            carta_data = _carta_a_dict(natal)
             
             self._carta_natal_cache = carta_data
             logger.debug("Carta natal A calculada y cacheada")
@@ -89,40 +144,6 @@ class EnraizamientoCalculator:
             logger.error(f"Error calculando carta natal A: {e}")
             raise
     
-    @lru_cache(maxsize=1000)
-    def _get_carta_electiva_cached(self, momento_tuple: tuple) -> Dict:
-        """
-        Calcula la carta para el momento electivo B(n) con cache inteligente
-
-        Args:
-            momento_tuple: Tuple (timestamp, lat, lon) para cache hashable
-
-        Returns:
-            Dict con datos de la carta electiva
-        """
-        timestamp, lat, lon = momento_tuple
-        momento_electivo = datetime.fromtimestamp(timestamp)
-
-        try:
-            # Crear carta electiva usando immanuel
-            subject = charts.Subject(momento_electivo, lat, lon)
-            natal = charts.Natal(subject)
-
-            # Convertir a JSON para facilitar análisis
-            carta_data = {
-                'planetas': json.loads(json.dumps(natal.objects, cls=ToJSON, indent=4)),
-                'casas': json.loads(json.dumps(natal.houses, cls=ToJSON, indent=4)),
-                'aspectos': json.loads(json.dumps(natal.aspects, cls=ToJSON, indent=4)),
-                'asc_grados': json.loads(json.dumps(natal.objects, cls=ToJSON))["3000001"]["longitude"]["raw"],
-                'asc_signo': json.loads(json.dumps(natal.objects, cls=ToJSON))["3000001"]["sign"]["number"]
-            }
-
-            return carta_data
-
-        except Exception as e:
-            logger.error(f"Error calculando carta electiva B(n): {e}")
-            raise
-
     def _get_carta_electiva(self, momento_electivo: datetime, lat: float, lon: float) -> Dict:
         """
         Wrapper para obtener carta electiva con cache
@@ -135,9 +156,12 @@ class EnraizamientoCalculator:
         Returns:
             Dict con datos de la carta electiva
         """
-        # Convertir a tuple hashable para cache
-        momento_tuple = (momento_electivo.timestamp(), lat, lon)
-        return self._get_carta_electiva_cached(momento_tuple)
+        # Cache a nivel de módulo: compartido entre instancias y requests
+        return _calcular_carta_electiva(
+            cuantizar_momento(momento_electivo),
+            round(lat * 1e4),
+            round(lon * 1e4)
+        )
     
     def calcular_enraizamiento_avanzado(self, momento_electivo: datetime, 
                                       lat: float, lon: float, tema_consulta: str) -> Dict:
@@ -160,15 +184,18 @@ class EnraizamientoCalculator:
             } o None si momento no apto
         """
         try:
+            # Carta B(n) una sola vez para ambas fases
+            carta_B = self._get_carta_electiva(momento_electivo, lat, lon)
+
             # FASE 1: EVALUACIÓN DE CALIDAD DEL MOMENTO (Filtros + Puntaje)
-            resultado_fase1 = self._evaluar_fase1_calidad(momento_electivo, lat, lon)
+            resultado_fase1 = self._evaluar_fase1_calidad(momento_electivo, lat, lon, carta_B)
             
             if not resultado_fase1['apto']:
                 # Momento descartado por filtros
                 return None
             
             # FASE 2: ENRAIZAMIENTO PURO (EL GRAN JUEZ)
-            resultado_enraizamiento_puro = self._calcular_enraizamiento_puro_completo(momento_electivo, lat, lon)
+            resultado_enraizamiento_puro = self._calcular_enraizamiento_puro_completo(momento_electivo, lat, lon, carta_B)
             score_enraizamiento = resultado_enraizamiento_puro['score']
 
             # Preparar resultado
@@ -185,19 +212,20 @@ class EnraizamientoCalculator:
                 }
             }
             
-            logger.debug(f"Momento evaluado: {momento_electivo} - "
-                        f"Enraizamiento: {score_enraizamiento:.3f}, "
-                        f"Calidad: {resultado_fase1['score_normalizado']:.3f}")
+            logger.debug("Momento evaluado: %s - Enraizamiento: %.3f, Calidad: %.3f",
+                         momento_electivo, score_enraizamiento, resultado_fase1['score_normalizado'])
             
             return resultado
             
         except Exception as e:
             logger.error(f"Error en evaluación de momento: {e}")
             return None
-    
-    def _evaluar_fase1_calidad(self, momento_electivo: datetime, lat: float, lon: float) -> Dict:
+
+    def _evaluar_fase1_calidad(self, momento_electivo: datetime, lat: float, lon: float,
+                               carta_B: Optional[Dict] = None) -> Dict:
         """
         Evalúa la calidad del momento usando filtros y puntajes de Fase 1
+        Si no se recibe carta_B se obtiene de la carta electiva cacheada
         
         Returns:
             Dict: {
@@ -207,42 +235,50 @@ class EnraizamientoCalculator:
                 'detalles': dict
             }
         """
+        # Los filtros van del más barato al más caro: el ASC solo necesita la
+        # carta B(n) cacheada; Luna y regentes instancian los módulos legacy
         try:
             # VERIFICACIÓN CRÍTICA PREVIA: ASC B(n) en casa 8 o 12 de A = DESCARTE AUTOMÁTICO
             carta_A = self._get_carta_natal()
-            carta_B = self._get_carta_electiva(momento_electivo, lat, lon)
+            if carta_B is None:
+                carta_B = self._get_carta_electiva(momento_electivo, lat, lon)
             
             asc_moment = carta_B['asc_grados']
             casa_8 = self._asc_en_casa_natal(asc_moment, carta_A, 8)
-            casa_12 = self._asc_en_casa_natal(asc_moment, carta_A, 12)
+            # Si ya cayó en casa 8 el resultado de la 12 no cambia el descarte
+            casa_12 = not casa_8 and self._asc_en_casa_natal(asc_moment, carta_A, 12)
             
             if casa_8 or casa_12:
-                logger.debug(f"Momento {momento_electivo} DESCARTADO en Fase 1: ASC en casa {'8' if casa_8 else '12'} natal")
+                logger.debug("Momento %s DESCARTADO en Fase 1: ASC en casa %s natal",
+                             momento_electivo, '8' if casa_8 else '12')
                 return {
                     'apto': False, 
                     'razon': f'ASC momento en casa {"8" if casa_8 else "12"} natal - DESCARTE AUTOMÁTICO'
                 }
             
-            from core.legacy_wrapper import LegacyAstroWrapper
+            from core.legacy_wrapper import get_wrapper
             
-            # Crear wrapper para momento electivo B(n)
-            wrapper_B = LegacyAstroWrapper(momento_electivo, lat, lon)
+            # Wrapper para momento electivo B(n) (cacheado por momento)
+            wrapper_B = get_wrapper(momento_electivo, lat, lon)
             
             # 1. EVALUAR LUNA (Filtro + Puntos)
             eval_luna = wrapper_B.evaluar_luna_completo()
             if not eval_luna['apto']:
+                logger.debug("Momento %s DESCARTADO en Fase 1: Luna no apta", momento_electivo)
                 return {'apto': False, 'razon': 'Luna no apta'}
             puntos_luna = eval_luna['puntos_luna']
             
             # 2. EVALUAR REGENTE ASC (Filtro + Puntos)
             eval_asc = wrapper_B.evaluar_regente_asc_completo()
             if not eval_asc['apto']:
+                logger.debug("Momento %s DESCARTADO en Fase 1: Regente ASC no apto", momento_electivo)
                 return {'apto': False, 'razon': 'Regente ASC no apto'}
             puntos_asc = eval_asc['puntos_regente_asc']
             
             # 3. EVALUAR REGENTE CASA 10 (Filtro + Puntos)
             eval_casa10 = wrapper_B.evaluar_regente_casa10_completo()
             if not eval_casa10['apto']:
+                logger.debug("Momento %s DESCARTADO en Fase 1: Regente Casa 10 no apto", momento_electivo)
                 return {'apto': False, 'razon': 'Regente Casa 10 no apto'}
             puntos_casa10 = eval_casa10['puntos_regente_casa10']
             
@@ -295,6 +331,16 @@ class EnraizamientoCalculator:
             logger.error(f"Error en evaluación Fase 1: {e}")
             return {'apto': False, 'razon': f'Error: {e}'}
     
+    def _get_original_calc(self):
+        """
+        Calculador de las 23 condiciones originales, creado una sola vez por
+        instancia: la carta A es la misma para todos los momentos
+        """
+        if self._original_calc is None:
+            from core.original_enraizamiento import OriginalEnraizamientoCalculator
+            self._original_calc = OriginalEnraizamientoCalculator(self.datos_natales)
+        return self._original_calc
+
     def _calcular_enraizamiento_puro(self, momento_electivo: datetime, lat: float, lon: float) -> float:
         """
         Calcula el enraizamiento puro usando las 23 condiciones originales
@@ -303,11 +349,8 @@ class EnraizamientoCalculator:
             float: Score de enraizamiento (0.0-1.0)
         """
         try:
-            from core.original_enraizamiento import OriginalEnraizamientoCalculator
-
             # Usar el calculador de enraizamiento original optimizado
-            original_calc = OriginalEnraizamientoCalculator(self.datos_natales)
-            resultado_original = original_calc.calcular_enraizamiento_original(
+            resultado_original = self._get_original_calc().calcular_enraizamiento_original(
                 momento_electivo, lat, lon
             )
 
@@ -319,21 +362,20 @@ class EnraizamientoCalculator:
             # Retornar valor neutro en caso de error
             return 0.5
 
-    def _calcular_enraizamiento_puro_completo(self, momento_electivo: datetime, lat: float, lon: float) -> Dict:
+    def _calcular_enraizamiento_puro_completo(self, momento_electivo: datetime, lat: float, lon: float,
+                                              carta_B: Optional[Dict] = None) -> Dict:
         """
         Calcula el enraizamiento puro usando las 23 condiciones originales
         Retorna toda la información del resultado original
+        carta_B: carta electiva ya obtenida en Fase 1 (se reutiliza)
 
         Returns:
             Dict: Resultado completo incluyendo puntos_total, score, etc.
         """
         try:
-            from core.original_enraizamiento import OriginalEnraizamientoCalculator
-
             # Usar el calculador de enraizamiento original optimizado
-            original_calc = OriginalEnraizamientoCalculator(self.datos_natales)
-            resultado_original = original_calc.calcular_enraizamiento_original(
-                momento_electivo, lat, lon
+            resultado_original = self._get_original_calc().calcular_enraizamiento_original(
+                momento_electivo, lat, lon, carta_B
             )
 
             # Retornar resultado completo
@@ -408,8 +450,8 @@ class EnraizamientoCalculator:
         }
         
         for planeta_id, planeta_nombre in planetas_importantes.items():
-            if planeta_id in carta_A['planetas']:
-                planeta_A_grados = carta_A['planetas'][planeta_id]['longitude']['raw']
+            if planeta_id in carta_A['planeta_longs']:
+                planeta_A_grados = carta_A['planeta_longs'][planeta_id]
                 
                 # Calcular aspecto
                 aspecto = self._calcular_aspecto(asc_B_grados, planeta_A_grados)
@@ -434,10 +476,10 @@ class EnraizamientoCalculator:
         
         # Obtener cúspide de casa tema en B(n)
         casa_id = str(2000000 + casa_tema)
-        if casa_id not in carta_B['casas']:
+        if casa_id not in carta_B['casa_longs']:
             return conexiones
             
-        casa_tema_grados = carta_B['casas'][casa_id]['longitude']['raw']
+        casa_tema_grados = carta_B['casa_longs'][casa_id]
         
         # Planetas importantes para casa tema
         planetas_importantes = {
@@ -448,8 +490,8 @@ class EnraizamientoCalculator:
         }
         
         for planeta_id, planeta_nombre in planetas_importantes.items():
-            if planeta_id in carta_A['planetas']:
-                planeta_A_grados = carta_A['planetas'][planeta_id]['longitude']['raw']
+            if planeta_id in carta_A['planeta_longs']:
+                planeta_A_grados = carta_A['planeta_longs'][planeta_id]
                 
                 # Calcular aspecto
                 aspecto = self._calcular_aspecto(casa_tema_grados, planeta_A_grados)
@@ -476,15 +518,15 @@ class EnraizamientoCalculator:
         asc_signo_B = carta_B['asc_signo']
         regente_asc_B = dignities.TRADITIONAL_RULERSHIPS[asc_signo_B]
         
-        if str(regente_asc_B) in carta_B['planetas']:
-            regente_B_grados = carta_B['planetas'][str(regente_asc_B)]['longitude']['raw']
+        if str(regente_asc_B) in carta_B['planeta_longs']:
+            regente_B_grados = carta_B['planeta_longs'][str(regente_asc_B)]
             
             # Analizar aspectos con planetas A
             planetas_A = ['4000001', '4000002', '4000004', '4000006']  # Sol, Luna, Venus, Júpiter
             
             for planeta_id in planetas_A:
-                if planeta_id in carta_A['planetas']:
-                    planeta_A_grados = carta_A['planetas'][planeta_id]['longitude']['raw']
+                if planeta_id in carta_A['planeta_longs']:
+                    planeta_A_grados = carta_A['planeta_longs'][planeta_id]
                     
                     aspecto = self._calcular_aspecto(regente_B_grados, planeta_A_grados)
                     
@@ -515,8 +557,8 @@ class EnraizamientoCalculator:
         }
         
         for planeta_id, planeta_nombre in planetas_A.items():
-            if planeta_id in carta_A['planetas']:
-                planeta_A_grados = carta_A['planetas'][planeta_id]['longitude']['raw']
+            if planeta_id in carta_A['planeta_longs']:
+                planeta_A_grados = carta_A['planeta_longs'][planeta_id]
                 
                 aspecto = self._calcular_aspecto(asc_B_grados, planeta_A_grados)
                 
@@ -545,8 +587,8 @@ class EnraizamientoCalculator:
         }
         
         for planeta_id, planeta_nombre in planetas_problematicos.items():
-            if planeta_id in carta_A['planetas']:
-                planeta_A_grados = carta_A['planetas'][planeta_id]['longitude']['raw']
+            if planeta_id in carta_A['planeta_longs']:
+                planeta_A_grados = carta_A['planeta_longs'][planeta_id]
                 
                 aspecto = self._calcular_aspecto(asc_B_grados, planeta_A_grados)
                 
@@ -573,16 +615,7 @@ class EnraizamientoCalculator:
         if diff > 180:
             diff = 360 - diff
         
-        # Definir aspectos y orbes
-        aspectos = [
-            ('conjuncion', 0, ORBE_CONJUNCION),
-            ('sextil', 60, ORBE_TRIGONO_SEXTIL),
-            ('cuadratura', 90, ORBE_CUADRATURA_OPOSICION),
-            ('trigono', 120, ORBE_TRIGONO_SEXTIL),
-            ('oposicion', 180, ORBE_CUADRATURA_OPOSICION)
-        ]
-        
-        for nombre, angulo_exacto, orbe_maximo in aspectos:
+        for nombre, angulo_exacto, orbe_maximo in _ASPECTOS:
             orbe = abs(diff - angulo_exacto)
             if orbe <= orbe_maximo:
                 return {
@@ -656,34 +689,18 @@ class EnraizamientoCalculator:
         Determina si el ASC B(n) está en una casa específica de la carta natal A
         Método auxiliar para verificación de descarte automático
         """
-        try:
-            # Obtener información de la casa desde casas
-            casa_id = str(2000000 + numero_casa)
-            if casa_id not in carta_A['casas']:
-                logger.debug(f"Casa {numero_casa} no encontrada en carta natal")
-                return False
-            
-            casa_info = carta_A['casas'][casa_id]
-            house_start_degree = casa_info['longitude']['raw']
-            
-            # Calcular siguiente casa para obtener el rango
-            siguiente_casa_num = (numero_casa % 12) + 1
-            siguiente_casa_id = str(2000000 + siguiente_casa_num)
-            
-            if siguiente_casa_id in carta_A['casas']:
-                house_end_degree = carta_A['casas'][siguiente_casa_id]['longitude']['raw']
-            else:
-                # Fallback: asumir 30 grados
-                house_end_degree = (house_start_degree + 30) % 360
-            
-            # Verificar si ASC está en el rango de la casa
-            if house_start_degree <= house_end_degree:
-                # Casa no cruza 0°
-                return house_start_degree <= asc_grados <= house_end_degree
-            else:
-                # Casa cruza 0° (ej: casa empieza en 330° y termina en 30°)
-                return asc_grados >= house_start_degree or asc_grados <= house_end_degree
-                
-        except Exception as e:
-            logger.debug(f"Error verificando ASC en casa {numero_casa}: {e}")
+        # Cúspides de la casa y de la siguiente, resueltas de una vez
+        casa_longs = carta_A['casa_longs']
+        house_start_degree = casa_longs.get(_CASA_IDS[numero_casa])
+        if house_start_degree is None:
+            logger.debug("Casa %d no encontrada en carta natal", numero_casa)
             return False
+        
+        house_end_degree = casa_longs.get(_CASA_IDS[numero_casa % 12 + 1])
+        if house_end_degree is None:
+            # Fallback: asumir 30 grados
+            house_end_degree = (house_start_degree + 30) % 360
+        
+        # Verificar si ASC está en el rango de la casa: medido desde la cúspide
+        # en aritmética modular, vale también si la casa cruza 0° (330° -> 30°)
+        return (asc_grados - house_start_degree) % 360 <= (house_end_degree - house_start_degree) % 360
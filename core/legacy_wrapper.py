@@ -4,12 +4,19 @@ Legacy Wrapper - Integra las clases astrológicas existentes con la nueva arquit
 
 import sys
 import os
-import json
+import time
+import pickle
+import sqlite3
+import logging
+import threading
 import pandas as pd
 from datetime import datetime
+from functools import lru_cache
 
 # CRÍTICO: Agregar path al código copiado
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'legacy_astro'))
+_RUTA_LEGACY_ASTRO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'legacy_astro'))
+if _RUTA_LEGACY_ASTRO not in sys.path:
+    sys.path.append(_RUTA_LEGACY_ASTRO)
 
 # Imports desde archivos copiados
 from legacy_astro.moon_aptitude import moonAptitude
@@ -18,11 +25,156 @@ from legacy_astro.rulership_10 import rulershipTen
 from legacy_astro.optimal_minutes import optimalMinutes
 from legacy_astro.negative_minutes import negativeMinutes
 from legacy_astro.settings_astro import astro_avanzada_settings
+from legacy_astro.chart_cache import natal_cacheado, cuantizar_momento
 
 # Imports de immanuel (misma configuración)
-from immanuel import charts
 from immanuel.const import chart, dignities
 from immanuel.classes.serialize import ToJSON
+from config.settings import CACHE_DIR, CACHE_ENABLED, CACHE_EXPIRY_HOURS
+
+logger = logging.getLogger(__name__)
+
+# CRÍTICO: Configurar immanuel ANTES de cualquier cálculo. Una vez por proceso
+# (como los módulos legacy_astro): nada más modifica los settings globales
+astro_avanzada_settings()
+
+# Cache en disco de las evaluaciones de regentes: dependen solo del momento y
+# el lugar, y las búsquedas vuelven a pasar por los mismos minutos entre
+# requests y reinicios de la API. Las entradas vencen a las CACHE_EXPIRY_HOURS.
+_RUTA_CACHE_REGENTES = os.path.join(CACHE_DIR, 'regentes.sqlite3')
+# Parte de cada clave: incrementar al cambiar las reglas de rulershipConditions/
+# rulershipTen, astro_avanzada_settings o el formato del resultado, así las
+# entradas anteriores dejan de leerse (y se borran al vencer)
+_VERSION_CACHE_REGENTES = 1
+_cache_regentes_local = threading.local()
+
+
+def _conexion_cache_regentes() -> sqlite3.Connection:
+    """
+    Conexión sqlite propia de cada hilo y proceso (no se comparten tras un
+    fork). Al abrirla se borran las entradas vencidas, lo que acota el archivo.
+    """
+    conexion = getattr(_cache_regentes_local, 'conexion', None)
+    if conexion is not None and _cache_regentes_local.pid == os.getpid():
+        return conexion
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conexion = sqlite3.connect(_RUTA_CACHE_REGENTES, timeout=5)
+    conexion.execute('PRAGMA journal_mode=WAL')
+    conexion.execute('PRAGMA synchronous=NORMAL')
+    conexion.execute('CREATE TABLE IF NOT EXISTS regentes (clave TEXT PRIMARY KEY, creado REAL, valor BLOB)')
+    conexion.execute('DELETE FROM regentes WHERE creado < ?', (time.time() - CACHE_EXPIRY_HOURS * 3600,))
+    conexion.commit()
+
+    _cache_regentes_local.conexion = conexion
+    _cache_regentes_local.pid = os.getpid()
+    return conexion
+
+
+def _leer_cache_regentes(clave: str):
+    """Resultado guardado para la clave, o None si no hay uno vigente"""
+    if not CACHE_ENABLED:
+        return None
+    try:
+        fila = _conexion_cache_regentes().execute(
+            'SELECT creado, valor FROM regentes WHERE clave = ?', (clave,)
+        ).fetchone()
+    except sqlite3.Error as e:
+        logger.debug("Cache de regentes no disponible: %s", e)
+        return None
+
+    if fila is None or fila[0] < time.time() - CACHE_EXPIRY_HOURS * 3600:
+        return None
+    try:
+        return pickle.loads(fila[1])
+    except Exception as e:
+        # Entrada corrupta o de otra versión del código: se recalcula
+        logger.debug("Entrada ilegible en cache de regentes (%s): %s", clave, e)
+        return None
+
+
+def _guardar_cache_regentes(clave: str, valor: dict) -> None:
+    """Guarda el resultado; si el cache falla la evaluación sigue igual"""
+    if not CACHE_ENABLED:
+        return
+    try:
+        conexion = _conexion_cache_regentes()
+        conexion.execute(
+            'INSERT OR REPLACE INTO regentes VALUES (?, ?, ?)',
+            (clave, time.time(), pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+        )
+        conexion.commit()
+    except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError) as e:
+        logger.debug("No se pudo guardar en cache de regentes: %s", e)
+
+
+_ENCODER_IMMANUEL = ToJSON()
+
+# Signos que descalifican a la Luna en moonSunConj (condición 3)
+_SIGNOS_LUNA_DESCALIFICADA = (chart.SCORPIO, chart.CAPRICORN)
+
+
+def _clave_json(clave) -> str:
+    """Clave de dict como la escribe json.dumps (int/float/bool/None -> str)"""
+    if isinstance(clave, str):
+        return str(clave)
+    if clave is True:
+        return 'true'
+    if clave is False:
+        return 'false'
+    if clave is None:
+        return 'null'
+    if isinstance(clave, int):
+        return int.__repr__(clave)
+    if isinstance(clave, float):
+        return float.__repr__(clave)
+    raise TypeError(f"Clave no serializable a JSON: {clave!r}")
+
+
+def _to_plain(obj):
+    """
+    Equivalente a json.loads(json.dumps(obj, cls=ToJSON)) sin pasar por texto:
+    los objetos immanuel se convierten con ToJSON.default y el resto queda
+    como lo dejaría el round-trip (claves str, tuplas como listas, subclases
+    de int/float/str como tipos base).
+    """
+    if isinstance(obj, str):
+        return str(obj)
+    if obj is None or obj is True or obj is False:
+        return obj
+    if isinstance(obj, int):
+        return int(obj)
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, (list, tuple)):
+        return [_to_plain(valor) for valor in obj]
+    if isinstance(obj, dict):
+        return {_clave_json(clave): _to_plain(valor) for clave, valor in obj.items()}
+    return _to_plain(_ENCODER_IMMANUEL.default(obj))
+
+
+@lru_cache(maxsize=4096)
+def _calcular_chart_data(fecha_hora: datetime, lat_q: int, lon_q: int) -> dict:
+    """
+    Carta para enraizamiento cacheada por momento y lugar cuantizados
+    (0.1 s de hora local, ver cuantizar_momento, y 1e-4° de coordenadas),
+    así los momentos y cartas natales repetidos no vuelven a pasar por immanuel.
+    """
+    natal = natal_cacheado(fecha_hora, lat_q / 1e4, lon_q / 1e4)
+
+    # Mismos dicts que el JSON de moon_aptitude.py, sin serializar a texto
+    objects_json = _to_plain(natal.objects)
+    houses_json = _to_plain(natal.houses)
+    aspects_json = _to_plain(natal.aspects)
+
+    return {
+        'asc_grados': objects_json["3000001"]["longitude"]["raw"],
+        'asc_signo': objects_json["3000001"]["sign"]["number"],
+        'casas': houses_json,
+        'planetas': objects_json,
+        'aspectos': aspects_json,
+        'moon_phase': _to_plain(natal.moon_phase)
+    }
 
 class LegacyAstroWrapper:
     """
@@ -30,113 +182,86 @@ class LegacyAstroWrapper:
     con la nueva arquitectura optimizada
     """
     
+    # Condiciones de Luna: (método de moonAptitude, índice en resultado[0], etiqueta).
+    # Índice None: el método devuelve el flag directo en resultado[0]
+    _DESCAL_SPEC = (
+        ('moonSunConj', 0, 'conjuncion_sol_8_grados'),              # Conjunción Sol ±8°
+        ('moonSunConj', 1, 'oposicion_sol_8_grados'),               # Oposición Sol ±8°
+        ('moonSunConj', 2, 'luna_capricornio_escorpio'),            # Luna en Capricornio/Escorpio
+        ('moonMarte', 0, 'cuadratura_marte_con_salvadores'),        # Cuadratura Marte con salvadores
+        ('moonMarte', 1, 'oposicion_marte_con_salvadores'),         # Oposición Marte con salvadores
+        ('moonMarte', 2, 'conjuncion_marte_especial'),              # Conjunción Marte especial
+        ('moonMarte', 3, 'conjuncion_marte_con_salvadores'),        # Conjunción Marte con salvadores
+        ('moonSat', 0, 'cuadratura_saturno_con_salvadores'),        # Cuadratura Saturno con salvadores
+        ('moonSat', 1, 'oposicion_saturno_con_salvadores'),         # Oposición Saturno con salvadores
+        ('moonSat', 2, 'conjuncion_saturno_especial'),              # Conjunción Saturno especial
+        ('moonSat', 3, 'conjuncion_saturno_con_salvadores'),        # Conjunción Saturno con salvadores
+        ('moonPeleg', 0, 'luna_peregrina'),                         # Luna peregrina
+        ('moonGem', 0, 'luna_29_geminis'),                          # Luna 29° Géminis
+        ('moonEmpty', None, 'luna_vacia_curso'),                    # Luna vacía de curso
+        ('moonViaComb', 0, 'luna_via_combusta'),                    # Luna vía combusta
+    )
+    # Puntuadores: los puntos salen de resultado[4][índice]
+    _PUNT_SPEC = (
+        ('moonIs', 0, 'luna_cancer'),                               # Luna en Cáncer
+        ('moonIs', 1, 'luna_tauro'),                                # Luna en Tauro
+        ('moonCres', 0, 'luna_creciente'),                          # Luna creciente
+        ('moonJup', 0, 'luna_trigono_jupiter'),                     # Luna trígono Júpiter aplicativo
+        ('moonJup', 1, 'luna_sextil_jupiter'),                      # Luna sextil Júpiter aplicativo
+        ('moonJup', 2, 'luna_conjuncion_jupiter'),                  # Luna conjunción Júpiter
+        ('moonVen', 0, 'luna_trigono_venus'),                       # Luna trígono Venus aplicativo
+        ('moonVen', 1, 'luna_sextil_venus'),                        # Luna sextil Venus aplicativo
+        ('moonVen', 2, 'luna_conjuncion_venus'),                    # Luna conjunción Venus
+        ('moonSun', 0, 'luna_trigono_sol'),                         # Luna trígono Sol aplicativo
+        ('moonSun', 1, 'luna_sextil_sol'),                          # Luna sextil Sol aplicativo
+        ('moonHouse', 0, 'luna_casas_favorables'),                  # Luna en casas favorables
+        ('moonAscRuler', 0, 'luna_trigono_regente_asc'),            # Luna trígono regente ASC
+        ('moonAscRuler', 1, 'luna_sextil_regente_asc'),             # Luna sextil regente ASC
+        ('moonAscRuler', 2, 'luna_conjuncion_regente_asc'),         # Luna conjunción regente ASC
+        ('moonHouseReg', 0, 'luna_trigono_regente_casa10'),         # Luna trígono regente Casa 10
+        ('moonHouseReg', 1, 'luna_sextil_regente_casa10'),          # Luna sextil regente Casa 10
+        ('moonHouseReg', 2, 'luna_conjuncion_regente_casa10'),      # Luna conjunción regente Casa 10
+    )
+    # Métodos a evaluar, sin repetir y en el orden de las tablas
+    _METODOS_LUNA = tuple(dict.fromkeys(metodo for metodo, _, _ in _DESCAL_SPEC + _PUNT_SPEC))
+    
     def __init__(self, fecha_hora, lat, lon):
         self.fecha_hora = fecha_hora
         self.lat = lat
         self.lon = lon
         
-        # CRÍTICO: Configurar immanuel ANTES de cualquier cálculo
-        astro_avanzada_settings()
-        
         # Instanciar clase principal del sistema actual
         self.moon_module = moonAptitude(fecha_hora, lat, lon)
     
+    def _clave_cache(self, evaluacion: str) -> str:
+        """Clave del cache en disco: misma cuantización que _calcular_chart_data"""
+        return (f"v{_VERSION_CACHE_REGENTES}:{evaluacion}:{cuantizar_momento(self.fecha_hora).isoformat()}:"
+                f"{round(self.lat * 1e4)}:{round(self.lon * 1e4)}")
+    
     def evaluar_luna_completo(self):
         """
         Usa la lógica exacta del sistema actual para Luna
         TODOS los métodos verificados en moon_aptitude.py
         """
-        descalificadores = []
-        puntuadores = []
+        # Cada método de moonAptitude se evalúa una sola vez
+        resultados = {
+            metodo: getattr(self.moon_module, metodo)()
+            for metodo in self._METODOS_LUNA
+        }
         
         # DESCALIFICADORES (15 condiciones) - Métodos exactos verificados
-        moonSunConj_result = self.moon_module.moonSunConj()
-        if moonSunConj_result[0][0]:  # Conjunción Sol ±8°
-            descalificadores.append("conjuncion_sol_8_grados")
-        if moonSunConj_result[0][1]:  # Oposición Sol ±8°
-            descalificadores.append("oposicion_sol_8_grados")
-        if moonSunConj_result[0][2]:  # Luna en Capricornio/Escorpio
-            descalificadores.append("luna_capricornio_escorpio")
-            
-        moonMarte_result = self.moon_module.moonMarte()
-        if moonMarte_result[0][0]:  # Cuadratura Marte con salvadores
-            descalificadores.append("cuadratura_marte_con_salvadores")
-        if moonMarte_result[0][1]:  # Oposición Marte con salvadores
-            descalificadores.append("oposicion_marte_con_salvadores")
-        if moonMarte_result[0][2]:  # Conjunción Marte especial
-            descalificadores.append("conjuncion_marte_especial")
-        if moonMarte_result[0][3]:  # Conjunción Marte con salvadores
-            descalificadores.append("conjuncion_marte_con_salvadores")
-            
-        moonSat_result = self.moon_module.moonSat()
-        if moonSat_result[0][0]:  # Cuadratura Saturno con salvadores
-            descalificadores.append("cuadratura_saturno_con_salvadores")
-        if moonSat_result[0][1]:  # Oposición Saturno con salvadores
-            descalificadores.append("oposicion_saturno_con_salvadores")
-        if moonSat_result[0][2]:  # Conjunción Saturno especial
-            descalificadores.append("conjuncion_saturno_especial")
-        if moonSat_result[0][3]:  # Conjunción Saturno con salvadores
-            descalificadores.append("conjuncion_saturno_con_salvadores")
-            
-        if self.moon_module.moonPeleg()[0][0]:  # Luna peregrina
-            descalificadores.append("luna_peregrina")
-        if self.moon_module.moonGem()[0][0]:  # Luna 29° Géminis
-            descalificadores.append("luna_29_geminis")
-        if self.moon_module.moonEmpty()[0]:  # Luna vacía de curso
-            descalificadores.append("luna_vacia_curso")
-        if self.moon_module.moonViaComb()[0][0]:  # Luna vía combusta
-            descalificadores.append("luna_via_combusta")
+        descalificadores = [
+            etiqueta
+            for metodo, indice, etiqueta in self._DESCAL_SPEC
+            if (resultados[metodo][0] if indice is None else resultados[metodo][0][indice])
+        ]
         
         # PUNTUADORES (18 condiciones) - Métodos exactos verificados
-        moonIs_result = self.moon_module.moonIs()
-        if moonIs_result[0][0]:  # Luna en Cáncer
-            puntuadores.append(("luna_cancer", moonIs_result[4][0]))
-        if moonIs_result[0][1]:  # Luna en Tauro
-            puntuadores.append(("luna_tauro", moonIs_result[4][1]))
-            
-        if self.moon_module.moonCres()[0][0]:  # Luna creciente
-            puntuadores.append(("luna_creciente", self.moon_module.moonCres()[4][0]))
-            
-        moonJup_result = self.moon_module.moonJup()
-        if moonJup_result[0][0]:  # Luna trígono Júpiter aplicativo
-            puntuadores.append(("luna_trigono_jupiter", moonJup_result[4][0]))
-        if moonJup_result[0][1]:  # Luna sextil Júpiter aplicativo
-            puntuadores.append(("luna_sextil_jupiter", moonJup_result[4][1]))
-        if moonJup_result[0][2]:  # Luna conjunción Júpiter
-            puntuadores.append(("luna_conjuncion_jupiter", moonJup_result[4][2]))
-            
-        moonVen_result = self.moon_module.moonVen()
-        if moonVen_result[0][0]:  # Luna trígono Venus aplicativo
-            puntuadores.append(("luna_trigono_venus", moonVen_result[4][0]))
-        if moonVen_result[0][1]:  # Luna sextil Venus aplicativo
-            puntuadores.append(("luna_sextil_venus", moonVen_result[4][1]))
-        if moonVen_result[0][2]:  # Luna conjunción Venus
-            puntuadores.append(("luna_conjuncion_venus", moonVen_result[4][2]))
-            
-        moonSun_result = self.moon_module.moonSun()
-        if moonSun_result[0][0]:  # Luna trígono Sol aplicativo
-            puntuadores.append(("luna_trigono_sol", moonSun_result[4][0]))
-        if moonSun_result[0][1]:  # Luna sextil Sol aplicativo
-            puntuadores.append(("luna_sextil_sol", moonSun_result[4][1]))
-            
-        if self.moon_module.moonHouse()[0][0]:  # Luna en casas favorables
-            puntuadores.append(("luna_casas_favorables", self.moon_module.moonHouse()[4][0]))
-            
-        moonAscRuler_result = self.moon_module.moonAscRuler()
-        if moonAscRuler_result[0][0]:  # Luna trígono regente ASC
-            puntuadores.append(("luna_trigono_regente_asc", moonAscRuler_result[4][0]))
-        if moonAscRuler_result[0][1]:  # Luna sextil regente ASC
-            puntuadores.append(("luna_sextil_regente_asc", moonAscRuler_result[4][1]))
-        if moonAscRuler_result[0][2]:  # Luna conjunción regente ASC
-            puntuadores.append(("luna_conjuncion_regente_asc", moonAscRuler_result[4][2]))
-            
-        moonHouseReg_result = self.moon_module.moonHouseReg()
-        if moonHouseReg_result[0][0]:  # Luna trígono regente Casa 10
-            puntuadores.append(("luna_trigono_regente_casa10", moonHouseReg_result[4][0]))
-        if moonHouseReg_result[0][1]:  # Luna sextil regente Casa 10
-            puntuadores.append(("luna_sextil_regente_casa10", moonHouseReg_result[4][1]))
-        if moonHouseReg_result[0][2]:  # Luna conjunción regente Casa 10
-            puntuadores.append(("luna_conjuncion_regente_casa10", moonHouseReg_result[4][2]))
+        puntuadores = [
+            (etiqueta, resultados[metodo][4][indice])
+            for metodo, indice, etiqueta in self._PUNT_SPEC
+            if resultados[metodo][0][indice]
+        ]
         
         return {
             'apto': len(descalificadores) == 0,
@@ -149,7 +274,13 @@ class LegacyAstroWrapper:
         """
         Evalúa el regente del ASC usando rulershipConditions
         Implementa todas las 51 condiciones especificadas
+        Cacheado en disco por momento y lugar (salvo el resultado de error)
         """
+        clave = self._clave_cache('regente_asc')
+        resultado = _leer_cache_regentes(clave)
+        if resultado is not None:
+            return resultado
+
         try:
             # Instanciar evaluador de regente ASC
             asc_evaluator = rulershipConditions(self.fecha_hora, self.lat, self.lon)
@@ -172,7 +303,7 @@ class LegacyAstroWrapper:
             puntos_data = asc_evaluator.cond_points()[0]
             puntos_total = sum(p for p in puntos_data.values() if p is not None and not pd.isna(p))
             
-            return {
+            resultado = {
                 'apto': len(descalificadores) == 0,
                 'descalificadores': descalificadores,
                 'puntos_regente_asc': puntos_total,
@@ -187,12 +318,21 @@ class LegacyAstroWrapper:
                 'puntos_regente_asc': 5.0,  # Valor medio
                 'max_puntos': 10.0
             }
+
+        _guardar_cache_regentes(clave, resultado)
+        return resultado
     
     def evaluar_regente_casa10_completo(self):
         """
         Evalúa el regente de Casa 10 usando rulershipTen
         Implementa todas las 36 condiciones especificadas
+        Cacheado en disco por momento y lugar (salvo el resultado de error)
         """
+        clave = self._clave_cache('regente_casa10')
+        resultado = _leer_cache_regentes(clave)
+        if resultado is not None:
+            return resultado
+
         try:
             # Instanciar evaluador de regente Casa 10
             casa10_evaluator = rulershipTen(self.fecha_hora, self.lat, self.lon)
@@ -215,7 +355,7 @@ class LegacyAstroWrapper:
             puntos_data = casa10_evaluator.cond_points()[0]
             puntos_total = sum(p for p in puntos_data.values() if p is not None and not pd.isna(p))
             
-            return {
+            resultado = {
                 'apto': len(descalificadores) == 0,
                 'descalificadores': descalificadores,
                 'puntos_regente_casa10': puntos_total,
@@ -230,6 +370,9 @@ class LegacyAstroWrapper:
                 'puntos_regente_casa10': 5.0,  # Valor medio
                 'max_puntos': 10.0
             }
+
+        _guardar_cache_regentes(clave, resultado)
+        return resultado
     
     def evaluar_combinaciones_positivas(self):
         """
@@ -243,20 +386,24 @@ class LegacyAstroWrapper:
             # Obtener tabla completa de evaluación
             df_resultados = positivas_evaluator.final_table()
             
-            # Extraer puntos total de la fila específica de resumen
             puntos_total = 0
-            for _, row in df_resultados.iterrows():
-                descripcion = str(row.get('descripcion', ''))
-                if 'Total Puntaje combinacion positiva para la carta B(n)' in descripcion and 'en %' not in descripcion:
-                    puntos_total = float(row.get('puntos', 0))
-                    break
-            
-            # Si no encontramos la fila de resumen, sumar manualmente las condiciones individuales
-            if puntos_total == 0:
-                for _, row in df_resultados.iterrows():
-                    if pd.notna(row.get('puntos', 0)) and isinstance(row['puntos'], (int, float)):
-                        if 0 < row['puntos'] <= 2 and pd.notna(row.get('cond_num', None)):  # Solo condiciones individuales
-                            puntos_total += row['puntos']
+            if 'puntos' in df_resultados:
+                puntos = pd.to_numeric(df_resultados['puntos'], errors='coerce')
+                
+                # Extraer puntos total de la fila específica de resumen
+                if 'descripcion' in df_resultados:
+                    descripcion = df_resultados['descripcion'].astype(str)
+                    es_resumen = (
+                        descripcion.str.contains('Total Puntaje combinacion positiva para la carta B(n)', regex=False)
+                        & ~descripcion.str.contains('en %', regex=False)
+                    )
+                    if es_resumen.any():
+                        puntos_total = float(puntos[es_resumen].iloc[0])
+                
+                # Si no encontramos la fila de resumen, sumar manualmente las condiciones individuales
+                if puntos_total == 0 and 'cond_num' in df_resultados:
+                    individuales = df_resultados['cond_num'].notna() & puntos.between(0, 2, inclusive='right')
+                    puntos_total = float(puntos[individuales].sum())
             
             # Asegurar que no exceda el máximo
             puntos_total = min(puntos_total, 7.0)
@@ -299,12 +446,11 @@ class LegacyAstroWrapper:
             # Obtener tabla de evaluación
             df_resultados = negativas_evaluator.negative()
             
-            # Extraer puntos total (penúltima fila)
+            # Sumar puntos negativos (solo penalizaciones)
             puntos_total = 0
-            for _, row in df_resultados.iterrows():
-                if pd.notna(row.get('puntos', 0)) and isinstance(row['puntos'], (int, float)):
-                    if row['puntos'] < 0:  # Solo penalizaciones
-                        puntos_total += row['puntos']
+            if 'puntos' in df_resultados:
+                puntos = pd.to_numeric(df_resultados['puntos'], errors='coerce')
+                puntos_total = float(puntos[puntos < 0].sum())
             
             return {
                 'puntos_combinaciones_negativas': puntos_total,
@@ -322,26 +468,17 @@ class LegacyAstroWrapper:
         """
         Extrae datos necesarios para enraizamiento usando immanuel
         MISMO PATRÓN que moon_aptitude.py verificado
+        El resultado es compartido por el cache: no modificarlo.
         """
-        # CRÍTICO: Usar misma configuración que sistema actual
-        astro_avanzada_settings()
-        
-        subject = charts.Subject(self.fecha_hora, self.lat, self.lon)
-        natal = charts.Natal(subject)
-        
-        # Convertir a JSON exactamente como en moon_aptitude.py
-        objects_json = json.loads(json.dumps(natal.objects, cls=ToJSON, indent=4))
-        houses_json = json.loads(json.dumps(natal.houses, cls=ToJSON, indent=4))
-        aspects_json = json.loads(json.dumps(natal.aspects, cls=ToJSON, indent=4))
-        
-        return {
-            'asc_grados': objects_json["3000001"]["longitude"]["raw"],
-            'asc_signo': objects_json["3000001"]["sign"]["number"],
-            'casas': houses_json,
-            'planetas': objects_json,
-            'aspectos': aspects_json,
-            'moon_phase': json.loads(json.dumps(natal.moon_phase, cls=ToJSON, indent=4))
-        }
+        return _calcular_chart_data(
+            cuantizar_momento(self.fecha_hora),
+            round(self.lat * 1e4),
+            round(self.lon * 1e4)
+        )
+    
+    def _moon_sign_fast(self):
+        """Número de signo de la Luna, leído directo del JSON ya armado por moonAptitude"""
+        return self.moon_module.object_json[str(chart.MOON)]["sign"]["number"]
     
     def es_momento_critico_descalificado(self):
         """
@@ -349,25 +486,48 @@ class LegacyAstroWrapper:
         Solo verifica descalificadores críticos más importantes
         """
         try:
+            # Verificar Luna en Capricornio/Escorpio (solo lee el signo, lo más barato)
+            if self._moon_sign_fast() in _SIGNOS_LUNA_DESCALIFICADA:
+                return True, "luna_capricornio_escorpio"
+            
             # Verificar conjunción/oposición Sol (más crítico)
             moonSunConj_result = self.moon_module.moonSunConj()
             if moonSunConj_result[0][0] or moonSunConj_result[0][1]:
                 return True, "conjuncion_oposicion_sol"
             
-            # Verificar Luna vacía de curso (muy crítico)
+            # Verificar Luna vacía de curso (la más cara: solo si nada decidió antes)
             if self.moon_module.moonEmpty()[0]:
                 return True, "luna_vacia_curso"
             
-            # Verificar Luna en Capricornio/Escorpio
-            if moonSunConj_result[0][2]:
-                return True, "luna_capricornio_escorpio"
-            
             return False, None
             
         except Exception as e:
             # En caso de error, asumir que no está descalificado para continuar
             return False, f"error_evaluacion: {str(e)}"
 
+@lru_cache(maxsize=256)
+def _build_wrapper(fecha_hora: datetime, lat_q: int, lon_q: int) -> LegacyAstroWrapper:
+    """
+    LegacyAstroWrapper cacheado por momento y lugar cuantizados (misma
+    cuantización que _calcular_chart_data). El wrapper no se modifica después
+    de construido, así que el mismo objeto sirve para todas las evaluaciones
+    del momento. Mismo tamaño que natal_cacheado: cada wrapper retiene el
+    JSON de su carta.
+    """
+    return LegacyAstroWrapper(fecha_hora, lat_q / 1e4, lon_q / 1e4)
+
+
+def get_wrapper(fecha_hora, lat, lon) -> LegacyAstroWrapper:
+    """
+    Obtiene el LegacyAstroWrapper del momento, reutilizando uno ya construido
+    El wrapper es compartido por el cache: usarlo solo para lectura.
+    """
+    return _build_wrapper(
+        cuantizar_momento(fecha_hora),
+        round(lat * 1e4),
+        round(lon * 1e4)
+    )
+
 class CalculosAstrologicos:
     """
     Wrapper para immanuel que mantiene compatibilidad 
@@ -375,22 +535,19 @@ class CalculosAstrologicos:
     """
     
     def __init__(self, fecha_hora, lat, lon):
-        # CRÍTICO: Configurar immanuel ANTES de cualquier cálculo
-        astro_avanzada_settings()
+        self.natal = natal_cacheado(fecha_hora, lat, lon)
         
-        self.subject = charts.Subject(fecha_hora, lat, lon)
-        self.natal = charts.Natal(self.subject)
+        # Mismos dicts que el JSON del sistema actual, sin serializar a texto
+        self.aspects_json = _to_plain(self.natal.aspects)
+        self.objects_json = _to_plain(self.natal.objects)
+        self.moon_phase = _to_plain(self.natal.moon_phase)
+        self.houses_json = _to_plain(self.natal.houses)
         
-        # Convertir a JSON exactamente como el sistema actual
-        self.aspects_json = json.loads(
-            json.dumps(self.natal.aspects, cls=ToJSON, indent=4)
-        )
-        self.objects_json = json.loads(
-            json.dumps(self.natal.objects, cls=ToJSON, indent=4)
-        )
-        self.moon_phase = json.loads(
-            json.dumps(self.natal.moon_phase, cls=ToJSON, indent=4)
-        )
+        # Regente de cada casa (1-12), leído del número de signo de la cúspide
+        self._house_rulers = {
+            numero_casa: dignities.TRADITIONAL_RULERSHIPS[self.houses_json[str(2000000 + numero_casa)]["sign"]["number"]]
+            for numero_casa in range(1, 13)
+        }
     
     def regente_ascendente(self):
         """Obtiene el regente del ASC"""
@@ -399,19 +556,7 @@ class CalculosAstrologicos:
     
     def regente_casa(self, numero_casa):
         """Obtiene el regente de una casa específica"""
-        # Obtener signo de la casa
-        casa_info = str(self.natal.houses[2000000 + numero_casa])
-        signo_nombre = casa_info.split()[-1].upper()
-        
-        # Mapeo de nombres a números
-        signos_map = {
-            "ARIES": 1, "TAURUS": 2, "GEMINI": 3, "CANCER": 4,
-            "LEO": 5, "VIRGO": 6, "LIBRA": 7, "SCORPIO": 8,
-            "SAGITTARIUS": 9, "CAPRICORN": 10, "AQUARIUS": 11, "PISCES": 12
-        }
-        
-        signo_numero = signos_map[signo_nombre]
-        return dignities.TRADITIONAL_RULERSHIPS[signo_numero]
+        return self._house_rulers[numero_casa]
     
     def casa_de_planeta(self, planeta):
         """Obtiene la casa donde está un planeta"""
@@ -9,15 +9,18 @@ import os
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 from functools import lru_cache
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+_RAIZ_PROYECTO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _RAIZ_PROYECTO not in sys.path:
+    sys.path.append(_RAIZ_PROYECTO)
 
 from immanuel import charts
 from immanuel.const import chart, dignities
 from immanuel.classes.serialize import ToJSON
 from legacy_astro.settings_astro import astro_avanzada_settings
+from legacy_astro.chart_cache import natal_cacheado
 from config.settings import ORBE_CONJUNCION, ORBE_TRIGONO_SEXTIL
 
 logger = logging.getLogger(__name__)
@@ -86,9 +89,8 @@ class OriginalEnraizamientoCalculator:
     def _get_carta_electiva(self, momento_electivo: datetime, lat: float, lon: float) -> Dict:
         """Calcula la carta para el momento electivo B(n)"""
         try:
-            # Crear carta electiva usando immanuel
-            subject = charts.Subject(momento_electivo, lat, lon)
-            natal = charts.Natal(subject)
+            # Carta electiva (compartida con los módulos legacy del mismo momento)
+            natal = natal_cacheado(momento_electivo, lat, lon)
             
             # Convertir a JSON para facilitar análisis
             carta_data = {
@@ -107,7 +109,7 @@ class OriginalEnraizamientoCalculator:
             raise
     
     def calcular_enraizamiento_original(self, momento_electivo: datetime, 
-                                      lat: float, lon: float) -> Dict:
+                                      lat: float, lon: float, carta_B: Optional[Dict] = None) -> Dict:
         """
         Calcula el enraizamiento usando las 23 condiciones originales
         Mantiene el espíritu del código original con orbes actuales
@@ -116,6 +118,8 @@ class OriginalEnraizamientoCalculator:
             momento_electivo: Momento electivo a evaluar
             lat: Latitud del lugar
             lon: Longitud del lugar
+            carta_B: Carta B(n) ya calculada (necesita 'asc_grados' y '_houses');
+                     si no se recibe se calcula acá
             
         Returns:
             Dict con score, detalles y tabla de condiciones, o None si momento descartado
@@ -123,7 +127,8 @@ class OriginalEnraizamientoCalculator:
         try:
             # Obtener cartas
             carta_A = self._get_carta_natal()
-            carta_B = self._get_carta_electiva(momento_electivo, lat, lon)
+            if carta_B is None:
+                carta_B = self._get_carta_electiva(momento_electivo, lat, lon)
             
             # VERIFICACIÓN CRÍTICA: ASC B(n) en casa 8 o 12 de A = DESCARTE AUTOMÁTICO
             asc_moment = carta_B['asc_grados']
@@ -131,7 +136,8 @@ class OriginalEnraizamientoCalculator:
             casa_12 = self._asc_en_casa(asc_moment, carta_A, 12)
             
             if casa_8 or casa_12:
-                logger.debug(f"Momento {momento_electivo} DESCARTADO: ASC en casa {'8' if casa_8 else '12'} natal")
+                logger.debug("Momento %s DESCARTADO: ASC en casa %s natal",
+                             momento_electivo, '8' if casa_8 else '12')
                 return {
                     'descartado': True,
                     'razon': f'ASC momento en casa {"8" if casa_8 else "12"} natal',
@@ -175,8 +181,8 @@ class OriginalEnraizamientoCalculator:
                 'momento': momento_electivo
             }
             
-            logger.debug(f"Enraizamiento original: {porcentaje:.1f}% "
-                        f"(Rojos:{puntos_rojos}, Azules:{puntos_azules}) para {momento_electivo}")
+            logger.debug("Enraizamiento original: %.1f%% (Rojos:%s, Azules:%s) para %s",
+                         porcentaje, puntos_rojos, puntos_azules, momento_electivo)
             
             return resultado
             
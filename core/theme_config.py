@@ -1,4 +1,5 @@
 
+from functools import lru_cache
 from typing import Dict, TypedDict, Optional
 
 class ThemeConfig(TypedDict):
@@ -47,6 +48,7 @@ THEMES: Dict[str, ThemeConfig] = {
     }
 }
 
+@lru_cache(maxsize=None)
 def get_theme_config(theme_name: str) -> ThemeConfig:
     """Retorna la configuración para un tema dado."""
     return THEMES.get(theme_name.lower(), THEMES["trabajo"]) # Default to trabajo
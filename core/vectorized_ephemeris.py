@@ -37,6 +37,12 @@ class VectorizedEphemeris:
     IDX_LAT = 1
     IDX_DIST = 2
     IDX_SPEED_LONG = 3
+
+    # Julian Day de 1970-01-01T00:00 UT (origen de datetime64)
+    JD_UNIX_EPOCH = 2440587.5
+
+    # Flags fijos de cálculo: velocidades + efemérides suizas (alta precisión)
+    CALC_FLAGS = swe.FLG_SPEED | swe.FLG_SWIEPH
     
     def __init__(self):
         # Configurar efemérides (asegurar path si es necesario, 
@@ -72,18 +78,17 @@ class VectorizedEphemeris:
         # pero list comprehension es suficientemente rápido para ~10k-100k puntos.
         # Para >1M, se requeriría interacción C directa o chunking.
         
+        # Especialización del bucle interno: flags constantes, calc_ut ligado a
+        # un local y JDs como floats de Python (evita un escalar NumPy por llamada)
+        calc_ut = swe.calc_ut
+        flags = self.CALC_FLAGS
+        jd_list = jds.tolist()
+        
         for body in bodies:
-            # Flag FLG_SPEED para obtener velocidades
-            # Flag FLG_SWIEPH para usar efemérides suizas (alta precisión)
-            flags = swe.FLG_SPEED | swe.FLG_SWIEPH
-            
-            # List comprehension optimizada (lo más rápido en Python puro)
             # swe.calc_ut retorna ((lon, lat, dist, speed...), rflag)
             # Nos quedamos con la tupla de datos (índice 0)
-            
-            # NOTA: Para máxima velocidad, evitamos wrappers y llamadas extra
             try:
-                body_data = [swe.calc_ut(jd, body, flags)[0] for jd in jds]
+                body_data = [calc_ut(jd, body, flags)[0] for jd in jd_list]
                 
                 # Convertir a NumPy array (N, 6)
                 # 0: Longitude, 1: Latitude, 2: Distance, 3: Long. Speed, 4: Lat. Speed, 5: Dist. Speed
@@ -97,6 +102,9 @@ class VectorizedEphemeris:
 
     def _convert_times_to_jd(self, times: np.ndarray) -> np.ndarray:
         """Convierte array de datetimes a Julian Days (UTC)"""
+        if np.issubdtype(times.dtype, np.datetime64):
+            return self.datetime64_to_jd(times)
+        
         # Función auxiliar para aplicar vectorización si es posible, 
         # o map simple si son objetos datetime mixtos.
         
@@ -105,6 +113,14 @@ class VectorizedEphemeris:
         vfunc = np.vectorize(converter) 
         return vfunc(times)
 
+    @classmethod
+    def datetime64_to_jd(cls, times: np.ndarray) -> np.ndarray:
+        """
+        Julian Days (UT) de un array datetime64, en aritmética vectorial.
+        Equivale a swe.julday (calendario gregoriano) sin una llamada por momento.
+        """
+        return (times - np.datetime64(0, 's')) / np.timedelta64(1, 'D') + cls.JD_UNIX_EPOCH
+
     def _to_jd(self, t: datetime) -> float:
         """Convierte un datetime a Julian Day UT"""
         # swe.julday espera (año, mes, dia, hora_decimal)
@@ -122,3 +138,21 @@ class VectorizedEphemeris:
     def get_speeds(self, positions: Dict[int, np.ndarray]) -> Dict[int, np.ndarray]:
         """Extrae solo las velocidades longitudinales de los resultados completos"""
         return {k: v[:, self.IDX_SPEED_LONG] for k, v in positions.items()}
+
+    def get_longitude_matrix(self, positions: Dict[int, np.ndarray]) -> np.ndarray:
+        """
+        Longitudes como matriz contigua (max_id+1, N) indexada por ID de cuerpo.
+        Las filas de cuerpos no calculados quedan en cero.
+        """
+        return self._to_body_matrix(positions, self.IDX_LONG)
+
+    def get_speed_matrix(self, positions: Dict[int, np.ndarray]) -> np.ndarray:
+        """Velocidades longitudinales como matriz (max_id+1, N) indexada por ID de cuerpo"""
+        return self._to_body_matrix(positions, self.IDX_SPEED_LONG)
+
+    def _to_body_matrix(self, positions: Dict[int, np.ndarray], column: int) -> np.ndarray:
+        n_times = len(next(iter(positions.values())))
+        matrix = np.zeros((max(positions) + 1, n_times), dtype=np.float64)
+        for body, data in positions.items():
+            matrix[body] = data[:, column]
+        return matrix
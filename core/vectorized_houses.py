@@ -43,13 +43,17 @@ class VectorizedHouses:
         # Por ahora instanciamos (ligero overhead) o duplicamos.
         # Duplicamos la lógica simple para evitar dependencia circular o overhead.
         
-        jds = []
-        for t in times:
-            t_utc = t # Asumimos t ya es UTC o naive tratado como UT
-             # Si t es datetime
-            hour = t.hour + t.minute/60.0 + t.second/3600.0
-            jd = swe.julday(t.year, t.month, t.day, hour)
-            jds.append(jd)
+        if np.issubdtype(times.dtype, np.datetime64):
+            # Grilla datetime64: conversión vectorial compartida con VectorizedEphemeris
+            jds = VectorizedEphemeris.datetime64_to_jd(times)
+        else:
+            jds = []
+            for t in times:
+                t_utc = t # Asumimos t ya es UTC o naive tratado como UT
+                 # Si t es datetime
+                hour = t.hour + t.minute/60.0 + t.second/3600.0
+                jd = swe.julday(t.year, t.month, t.day, hour)
+                jds.append(jd)
             
         # SwissEph houses wrapper no es vectorizado. Hacemos list comprehension.
         # swe.houses(jd, lat, lon, hsys) -> returns (cusps, ascmc)
@@ -1,11 +1,26 @@
 
 import numpy as np
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union
+
+from .astro_config import AstroConfig
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+def angular_dist(x: np.ndarray, y: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Distancia angular mínima (0-180) entre longitudes, sin ramas:
+    |((x - y + 180) mod 360) - 180|, todo en un mismo buffer.
+    """
+    d = np.subtract(x, y, out=out)
+    np.add(d, 180.0, out=d)
+    np.mod(d, 360.0, out=d)
+    np.subtract(d, 180.0, out=d)
+    np.abs(d, out=d)
+    return d
+
+
 class VectorizedLogic:
     """
     Motor Lógico Vectorizado.
@@ -102,6 +117,16 @@ class VectorizedLogic:
             self.PISCES: [(12, 3), (16, 5), (19, 2), (28, 4), (30, 6)]    # Ven, Jup, Mer, Mar, Sat
         }
 
+    @staticmethod
+    def has_body(planet_positions: Union[Dict[int, np.ndarray], np.ndarray], body_id: int) -> bool:
+        """
+        True si hay posiciones para el cuerpo: acepta dict {id: array} o
+        matriz (max_id+1, N) indexada por ID de cuerpo.
+        """
+        if isinstance(planet_positions, np.ndarray):
+            return body_id < len(planet_positions)
+        return body_id in planet_positions
+
     def get_ruler_for_sign(self, sign_index: int) -> int:
         """Retorna SwissEph ID del regente tradicional del signo."""
         return self.RULER_MAP.get(sign_index, 0)
@@ -127,20 +152,14 @@ class VectorizedLogic:
             
         return np.isin(signs, good_signs)
 
-    def mask_debility(self, planet_id: int, longitudes: np.ndarray) -> np.ndarray:
+    def mask_debility(self, planet_ids: Union[int, np.ndarray], longitudes: np.ndarray) -> np.ndarray:
         """
         Retorna máscara True si el planeta está en Exilio o Caída.
+        `planet_ids` puede ser un ID escalar o un array (N,) con un ID por momento:
+        un solo gather sobre DEBILITY_TABLE[planeta, signo].
         """
         signs = self.get_sign_indices(longitudes)
-        
-        detriment_signs = self.DETRIMENT_MAP.get(planet_id, [])
-        fall_sign = self.FALL_MAP.get(planet_id)
-        
-        bad_signs = list(detriment_signs)
-        if fall_sign is not None:
-            bad_signs.append(fall_sign)
-            
-        return np.isin(signs, bad_signs)
+        return DEBILITY_TABLE[planet_ids, signs]
 
 
     def get_sign_indices(self, longitudes: np.ndarray) -> np.ndarray:
@@ -161,8 +180,7 @@ class VectorizedLogic:
         """
         Calcula la diferencia angular mínima (0-180) entre dos cuerpos.
         """
-        diff = np.abs(body1_longs - body2_longs)
-        return np.minimum(diff, 360 - diff)
+        return angular_dist(body1_longs, body2_longs)
 
     def mask_exact_aspect(self, body1: np.ndarray, body2: np.ndarray, 
                          aspect_angle: float, orb: float) -> np.ndarray:
@@ -173,7 +191,7 @@ class VectorizedLogic:
         return np.abs(ang_diff - aspect_angle) <= orb
 
     def mask_void_of_course(self, times: np.ndarray, moon_longs: np.ndarray, 
-                          planet_positions: Dict[int, np.ndarray]) -> np.ndarray:
+                          planet_positions: Union[Dict[int, np.ndarray], np.ndarray]) -> np.ndarray:
         """
         Detección Vectorizada de Luna Vacía de Curso (VoC).
         
@@ -199,66 +217,32 @@ class VectorizedLogic:
         # Si encontramos UN aspecto aplicativo dentro del signo, entonces NO es VoC (False)
         is_voc = np.ones(len(moon_longs), dtype=bool)
         
-        major_aspects = [0, 60, 90, 120, 180]
+        # Aspectos mayores como vector (1, A) para evaluar todos a la vez
+        major_aspects = AstroConfig.MAJOR_ASPECTS_NP[np.newaxis, :]
         
         # Planetas tradicionales a considerar (excluyendo Nodos y la misma Luna)
         # IDs: 0=Sun, 2=Merc, 3=Ven, 4=Mars, 5=Jup, 6=Sat
-        target_bodies = [0, 2, 3, 4, 5, 6] 
+        moon_col = moon_longs[:, np.newaxis]
+        ingress_col = dist_to_ingress[:, np.newaxis]
         
-        for pid in target_bodies:
-            if pid not in planet_positions: continue
+        for pid in AstroConfig.VOC_TARGETS:
+            if not self.has_body(planet_positions, pid): continue
             
-            p_longs = planet_positions[pid]
+            p_col = planet_positions[pid][:, np.newaxis]
             
-            # Calcular dónde ocurrirían los aspectos exactos proyectando posiciones
-            # Esto es complejo porque los planetas se mueven.
-            # Alternativa "Look Ahead" simplificada para POC:
-            # Si estamos en un punto t, miramos el futuro.
-            # Pero eso rompe la vectorización pura sin ventanas.
+            # Enfoque "Snapshot" (asume el otro planeta quieto; aceptable para horas):
+            # Lugares del zodíaco donde P formaría cada aspecto: P + A y P - A, shape (N, A).
+            # Distancia de la Luna a cada lugar (siempre hacia adelante, 0-360).
+            # Si alguna es menor que la distancia al cambio de signo, el aspecto
+            # ocurre dentro del signo actual y la Luna NO está vacía de curso.
+            dist_forward = (p_col + major_aspects - moon_col) % 360
+            dist_backward = (p_col - major_aspects - moon_col) % 360
             
-            # Enfoque "Snapshot":
-            # Un aspecto es aplicativo si:
-            # 1. El aspecto no es exacto todavía.
-            # 2. La Luna (más rápida) se acerca al punto del aspecto.
-            # 3. La distancia al aspecto es MENOR que la distancia al cambio de signo.
-            
-            # Ángulo actual entre cuerpos
-            angle = np.abs(moon_longs - p_longs) % 360
-            
-            for asp in major_aspects:
-                # Distancia al aspecto (considerando movimiento directo de Luna)
-                # Casos: 
-                # Luna 10, Sol 20 (Diff 10). Aspecto 0. Luna debe recorrer 10.
-                # Luna 10, Sol 70 (Diff 60). Aspecto 60. Luna YA lo hizo (separativo) o lo hará?
-                # Depende de quién es más rápido. Asumimos Luna siempre más rápida.
-                
-                # Simplificación: Calcular "distancia forward" al aspecto
-                # Target places en el zodíaco donde el planeta P formaría aspecto A
-                # places = [P + A, P - A]
-                
-                targets = [
-                    (p_longs + asp) % 360,
-                    (p_longs - asp) % 360
-                ]
-                
-                for target in targets:
-                    # Distancia de Luna a Target (siempre hacia adelante, 0-360)
-                    dist_to_target = (target - moon_longs) % 360
-                    
-                    # Si esa distancia es menor que la distancia al cambio de signo
-                    # ENTONCES el aspecto ocurre dentro del signo actual
-                    # Y por tanto, NO está vacía de curso
-                    
-                    # NOTA: Esto asume que el otro planeta está "quieto".
-                    # Para períodos cortos (horas), es aceptable.
-                    # Para mayor precisión, deberíamos usar velocidades relativas.
-                    # dist_real = dist_geo / (v_luna - v_planeta)
-                    
-                    aspect_occurs_in_sign = dist_to_target < dist_to_ingress
-                    
-                    # Si ocurre en signo -> is_voc False
-                    # Actualizamos máscara: Donde hallamos aspecto, VoC se apaga
-                    is_voc[aspect_occurs_in_sign] = False
+            aspect_occurs_in_sign = (
+                (dist_forward < ingress_col).any(axis=1)
+                | (dist_backward < ingress_col).any(axis=1)
+            )
+            is_voc &= ~aspect_occurs_in_sign
                     
         return is_voc
 
@@ -271,3 +255,22 @@ class VectorizedLogic:
         is_new = diff <= orb
         is_full = np.abs(diff - 180) <= orb
         return is_new | is_full
+
+
+# Tabla signo -> regente tradicional (12,), para resolver regentes por gather
+SIGN_TO_RULER = np.array(
+    [VectorizedLogic().get_ruler_for_sign(i) for i in range(12)], dtype=np.int8
+)
+
+# Tabla (cuerpo, signo) -> True si el cuerpo está en Exilio o Caída en ese signo
+def _build_debility_table() -> np.ndarray:
+    logic = VectorizedLogic()
+    table = np.zeros((max(logic.RULER_MAP.values()) + 1, 12), dtype=bool)
+    for planet_id, signs in logic.DETRIMENT_MAP.items():
+        table[planet_id, signs] = True
+    for planet_id, sign in logic.FALL_MAP.items():
+        table[planet_id, sign] = True
+    return table
+
+
+DEBILITY_TABLE = _build_debility_table()
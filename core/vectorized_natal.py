@@ -1,7 +1,7 @@
 
 import numpy as np
 from typing import Dict, List, Optional
-from .vectorized_logic import VectorizedLogic
+from .vectorized_logic import VectorizedLogic, angular_dist
 from .astro_config import AstroConfig
 
 class VectorizedNatal:
@@ -19,8 +19,7 @@ class VectorizedNatal:
         """
         Calcula ángulo (0-180) entre un cuerpo en tránsito (array) y un punto natal (float).
         """
-        diff = np.abs(transit_longs - natal_long)
-        return np.minimum(diff, 360 - diff)
+        return angular_dist(transit_longs, natal_long)
 
     def mask_transiting_aspect(self, 
                              transit_longs: np.ndarray, 
@@ -57,6 +56,9 @@ class VectorizedNatal:
         
         lights = [0, 1] # Sun, Moon
         
+        # Orbes resueltos una vez, fuera de los bucles
+        hard_aspects = [(angle, AstroConfig.get_orb(angle)) for angle in hard_angles]
+        
         for malefic_id in malefics:
             if malefic_id not in transits: continue
             
@@ -67,8 +69,7 @@ class VectorizedNatal:
                 
                 n_long = natal_chart[light_id]
                 
-                for angle in hard_angles:
-                    orb = AstroConfig.get_orb(angle)
+                for angle, orb in hard_aspects:
                     mask = self.mask_transiting_aspect(t_longs, n_long, angle, orb)
                     
                     # Accumulate badness
@@ -95,14 +96,16 @@ class VectorizedNatal:
         # We handle them separately as floats
         targets = [natal_asc, natal_mc]
         
+        # Orbes resueltos una vez, fuera de los bucles
+        soft_aspects = [(angle, AstroConfig.get_orb(angle)) for angle in soft_angles]
+        
         for benefic_id in benefics:
             if benefic_id not in transits: continue
             
             t_longs = transits[benefic_id]
             
             for target_long in targets:
-                for angle in soft_angles:
-                    orb = AstroConfig.get_orb(angle)
+                for angle, orb in soft_aspects:
                     mask = self.mask_transiting_aspect(t_longs, target_long, angle, orb)
                     is_good |= mask
                     
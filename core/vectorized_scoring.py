@@ -2,11 +2,15 @@
 import numpy as np
 import logging
 from typing import Dict, List, Tuple
-from .vectorized_logic import VectorizedLogic
+from .vectorized_logic import VectorizedLogic, SIGN_TO_RULER, angular_dist
 from .astro_config import AstroConfig
 
 logger = logging.getLogger(__name__)
 
+# Los puntajes son múltiplos de 0.5 en un rango chico: float32 los representa
+# exactamente y reduce a la mitad el ancho de banda de la agregación
+SCORE_DTYPE = np.float32
+
 class VectorizedScoring:
     """
     Motor de Puntuación Vectorizado ("The Scorer").
@@ -20,7 +24,7 @@ class VectorizedScoring:
                            times: np.ndarray,
                            moon_longs: np.ndarray,
                            sun_longs: np.ndarray,
-                           planet_longs: Dict[int, np.ndarray],
+                           planet_longs: np.ndarray,
                            house_cusps: np.ndarray,
                            ascmc: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
         """
@@ -52,7 +56,7 @@ class VectorizedScoring:
             details: Dict of arrays (score components)
         """
         N = len(moon_longs)
-        total_score = np.zeros(N, dtype=float)
+        total_score = np.zeros(N, dtype=SCORE_DTYPE)
         details = {}
 
         # --- 17 & 18: Signos (Cancer=3, Tauro=1) ---
@@ -82,7 +86,7 @@ class VectorizedScoring:
         # IDs: Sun=0, Ven=3, Jup=5
         
         def score_aspect(planet_id, aspect_angle, points, name):
-             if planet_id not in planet_longs:
+             if not self.logic.has_body(planet_longs, planet_id):
                  return
              p_pos = planet_longs[planet_id]
              # Orbit Check (Using standard aspect orb, e.g. 8 or 6 deg)
@@ -162,8 +166,8 @@ class VectorizedScoring:
         # Regente ASC is dynamic. Regente H10 is dynamic.
         # Passed in? No. We calculate them here or expected to be passed.
         # Efficiency: It's better to pass "ruler_asc_pos" and "ruler_mc_pos" arrays if computed outside.
-        # But we only have planet_longs dict.
-        # So we must compute Ruler IDs per moment, then gather positions.
+        # planet_longs es una matriz indexada por ID de cuerpo,
+        # so we compute Ruler IDs per moment, then gather positions.
         
         # 1. Identify Asc Sign -> Asc Ruler
         asc_longs = ascmc[:, 0]
@@ -178,28 +182,9 @@ class VectorizedScoring:
         # Construct array of Ruler Positions for each moment.
         
         def get_ruler_positions(signs_arr):
-            # signs_arr (N,)
-            # We map sign -> planet_id
-            # Then map planet_id -> position in that moment
-            
-            # Since we can't easily vector-index a dictionary of arrays,
-            # we iterate 12 signs? Or 7 planets?
-            # Iterate 7 planets is better (Sun..Saturn).
-            
-            ruler_pos_arr = np.zeros(N, dtype=float)
-            
-            for sign_id in range(12):
-                pid = self.logic.get_ruler_for_sign(sign_id)
-                if pid not in planet_longs: continue
-                
-                # Where Asc/MC Sign == sign_id
-                mask = (signs_arr == sign_id)
-                if not np.any(mask): continue
-                
-                # Copy planet positions for those moments
-                ruler_pos_arr[mask] = planet_longs[pid][mask]
-                
-            return ruler_pos_arr
+            # signs_arr (N,): signo -> regente (SIGN_TO_RULER) y un solo gather
+            # sobre la matriz de longitudes (fila = regente, columna = momento)
+            return planet_longs[SIGN_TO_RULER[signs_arr], np.arange(N)]
 
         ruler_asc_pos = get_ruler_positions(asc_signs)
         ruler_h10_pos = get_ruler_positions(mc_signs)
@@ -210,7 +195,7 @@ class VectorizedScoring:
         mask_sext_r_asc = self.logic.mask_exact_aspect(moon_longs, ruler_asc_pos, 60, 6.0)
         mask_trin_r_asc = self.logic.mask_exact_aspect(moon_longs, ruler_asc_pos, 120, 6.0)
         
-        score_r_asc = np.zeros(N)
+        score_r_asc = np.zeros(N, dtype=SCORE_DTYPE)
         score_r_asc += np.where(mask_conj_r_asc, 2.0, 0.0) # 29
         score_r_asc += np.where(mask_sext_r_asc, 2.0, 0.0) # 31
         score_r_asc += np.where(mask_trin_r_asc, 2.0, 0.0) # 33
@@ -223,7 +208,7 @@ class VectorizedScoring:
         mask_sext_r_h10 = self.logic.mask_exact_aspect(moon_longs, ruler_h10_pos, 60, 6.0)
         mask_trin_r_h10 = self.logic.mask_exact_aspect(moon_longs, ruler_h10_pos, 120, 6.0)
         
-        score_r_h10 = np.zeros(N)
+        score_r_h10 = np.zeros(N, dtype=SCORE_DTYPE)
         score_r_h10 += np.where(mask_conj_r_h10, 2.0, 0.0) # 30
         score_r_h10 += np.where(mask_sext_r_h10, 2.0, 0.0) # 32
         score_r_h10 += np.where(mask_trin_r_h10, 2.0, 0.0) # 34
@@ -239,7 +224,7 @@ class VectorizedScoring:
                             ruler_longs: np.ndarray,
                             ruler_ids: np.ndarray,
                             sun_longs: np.ndarray,
-                            planet_longs: Dict[int, np.ndarray],
+                            planet_longs: np.ndarray,
                             house_cusps: np.ndarray,
                             ruler_speeds: np.ndarray = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
         """
@@ -259,7 +244,7 @@ class VectorizedScoring:
         - Velocidad (Bonus/Malus)
         """
         N = len(ruler_longs)
-        total_score = np.zeros(N, dtype=float)
+        total_score = np.zeros(N, dtype=SCORE_DTYPE)
         details = {}
         prefix = f"ruler_{ruler_type.lower()}"
         
@@ -375,8 +360,7 @@ class VectorizedScoring:
             details[f'{prefix}_direct'] = score_direct
             
         # --- No Combusto (>17 deg Sol) (Rule 30/23) (+1) ---
-        diff_sun = np.abs(ruler_longs - sun_longs)
-        diff_sun = np.minimum(diff_sun, 360 - diff_sun)
+        diff_sun = angular_dist(ruler_longs, sun_longs)
         is_not_combust = (diff_sun > 17.0)
         score_not_combust = np.where(is_not_combust, 1.0, 0.0)
         total_score += score_not_combust
@@ -407,7 +391,7 @@ class VectorizedScoring:
         # Trigono/Sextil/Conjuntion -> +1 point each
         
         def add_aspect_points(target_pid, target_name):
-            if target_pid not in planet_longs: return
+            if not self.logic.has_body(planet_longs, target_pid): return
             target_pos = planet_longs[target_pid]
             
             # Conj (0), Sext (60), Trin (120)
@@ -424,7 +408,7 @@ class VectorizedScoring:
             mask_trin = self.logic.mask_exact_aspect(ruler_longs, target_pos, 120, 6.0)
             
             # Sum them up (assuming exclusive usually, but if mixed logic allow sum)
-            points = np.zeros(N)
+            points = np.zeros(N, dtype=SCORE_DTYPE)
             points += np.where(mask_conj, 1.0, 0.0)
             points += np.where(mask_sext, 1.0, 0.0)
             points += np.where(mask_trin, 1.0, 0.0)
@@ -464,7 +448,7 @@ class VectorizedScoring:
           - MC conj Luna A (+1)
         """
         N = len(times)
-        total_score = np.zeros(N, dtype=float)
+        total_score = np.zeros(N, dtype=SCORE_DTYPE)
         details = {}
         
         if not natal_chart:
@@ -505,7 +489,7 @@ class VectorizedScoring:
             mask_t = self.logic.mask_exact_aspect(elect_point, nat_arr, 120, 5.0)
             mask_s = self.logic.mask_exact_aspect(elect_point, nat_arr, 60, 5.0)
             
-            s = np.zeros(N)
+            s = np.zeros(N, dtype=SCORE_DTYPE)
             s += np.where(mask_c, points_conj, 0.0)
             s += np.where(mask_t, points_trine, 0.0)
             s += np.where(mask_s, points_sext, 0.0)
@@ -560,7 +544,7 @@ class VectorizedScoring:
                                    ruler_asc_longs: np.ndarray,
                                    ruler_h10_ids: np.ndarray,
                                    ruler_h10_longs: np.ndarray,
-                                   planet_longs: Dict[int, np.ndarray],
+                                   planet_longs: np.ndarray,
                                    ascmc: np.ndarray,
                                    cusps: np.ndarray,
                                    natal_asc_sign: int = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
@@ -583,7 +567,7 @@ class VectorizedScoring:
         7. Marte en ASC (-1)
         """
         N = len(times)
-        total_score = np.zeros(N, dtype=float)
+        total_score = np.zeros(N, dtype=SCORE_DTYPE)
         details = {}
         
         # --- POSITIVAS ---
@@ -611,17 +595,17 @@ class VectorizedScoring:
             return in_normal | in_cross
             
         # 2,3,4: Sun, Jup, Moon in H10
-        if 0 in planet_longs:
+        if self.logic.has_body(planet_longs, 0):
             s_sun = np.where(is_in_h10(planet_longs[0]), 2.0, 0.0)
             total_score += s_sun
             details['comb_pos_sun_h10'] = s_sun
             
-        if 5 in planet_longs:
+        if self.logic.has_body(planet_longs, 5):
             s_jup = np.where(is_in_h10(planet_longs[5]), 2.0, 0.0)
             total_score += s_jup
             details['comb_pos_jup_h10'] = s_jup
             
-        if 1 in planet_longs:
+        if self.logic.has_body(planet_longs, 1):
             s_moon = np.where(is_in_h10(planet_longs[1]), 2.0, 0.0)
             total_score += s_moon
             details['comb_pos_moon_h10'] = s_moon
@@ -637,7 +621,7 @@ class VectorizedScoring:
              if natal_asc_sign in [9, 10]: # Cap, Aqu
                  skip_saturn = True
                  
-        if not skip_saturn and 6 in planet_longs:
+        if not skip_saturn and self.logic.has_body(planet_longs, 6):
              sat_longs = planet_longs[6]
              # Saturn in H10 (-1)
              s_sat_h10 = np.where(is_in_h10(sat_longs), -1.0, 0.0)
@@ -663,7 +647,7 @@ class VectorizedScoring:
              if natal_asc_sign in [0, 7]:
                  skip_mars = True
                  
-        if not skip_mars and 4 in planet_longs:
+        if not skip_mars and self.logic.has_body(planet_longs, 4):
              mar_longs = planet_longs[4]
              # Mars in H10
              s_mar_h10 = np.where(is_in_h10(mar_longs), -1.0, 0.0)
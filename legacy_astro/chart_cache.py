@@ -0,0 +1,34 @@
+"""
+Cache compartido de cartas immanuel por (instante, lat, lon)
+
+Cada momento evaluado construye la misma carta en varios módulos
+(moonAptitude, rulershipConditions, rulershipTen, optimalMinutes,
+negativeMinutes, enraizamiento). Con este cache se calcula una sola vez
+por proceso y el resto de los módulos la reutiliza.
+"""
+from datetime import datetime
+from functools import lru_cache
+
+from immanuel import charts
+
+from legacy_astro.settings_astro import astro_avanzada_settings
+
+astro_avanzada_settings()
+
+
+@lru_cache(maxsize=256)
+def natal_cacheado(dob, lat, lon):
+    """
+    Devuelve charts.Natal para el instante y lugar dados.
+    El objeto es compartido entre llamadas: usarlo solo para lectura.
+    """
+    return charts.Natal(charts.Subject(dob, lat, lon))
+
+
+def cuantizar_momento(fecha_hora: datetime) -> datetime:
+    """
+    Momento truncado a 0.1 s para usar como clave de cache. Conserva la hora
+    local tal cual: pasar por timestamp()/fromtimestamp() la reinterpreta con
+    la zona del servidor y corre las horas cercanas a un cambio de horario.
+    """
+    return fecha_hora.replace(microsecond=fecha_hora.microsecond // 100_000 * 100_000)
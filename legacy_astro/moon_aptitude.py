@@ -1,7 +1,6 @@
 import json
 import os
 from datetime import datetime
-from immanuel import charts
 from immanuel.const import chart, dignities, calc
 from immanuel.classes.serialize import ToJSON
 from immanuel.setup import settings
@@ -13,6 +12,7 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from settings_astro import *
 from .utils.decorators import *
+from legacy_astro.chart_cache import natal_cacheado
 
 astro_avanzada_settings()
 
@@ -24,8 +24,7 @@ class moonAptitude:
         self.activity = act
         
         try:
-            subject = charts.Subject(dob, lat, lon)
-            self.natal = charts.Natal(subject)
+            self.natal = natal_cacheado(dob, lat, lon)
             aspects_json = json.dumps(self.natal.aspects, cls=ToJSON, indent=4)
             self.aspect_json = json.loads(aspects_json)
             objects_json = json.dumps(self.natal.objects, cls=ToJSON, indent=4)
@@ -690,8 +689,7 @@ class moonAptitude:
         diff_raw = [np.nan]
         puntos= []
         # Instancio para armar la data
-        subject = charts.Subject(self.dob, self.lat, self.lon)
-        natal = charts.Natal(subject)
+        natal = natal_cacheado(self.dob, self.lat, self.lon)
         house= natal.house_for(natal.objects[4000002])
         if (house== 2000005 or house==2000005 or house==2000009 or house==2000010 or house==2000011):
             cond_bool.append(True)
@@ -769,8 +767,7 @@ class moonAptitude:
     #la luna esta en trigno aplicativo al regente de la casa 10 (32)
     #la luna esta en sextil aplicativa al regente de la casa 10 (34)
     def moonHouseReg(self):
-        subject = charts.Subject(self.dob, self.lat, self.lon)
-        natal = charts.Natal(subject)
+        natal = natal_cacheado(self.dob, self.lat, self.lon)
 
         signos= { "ARIES" :1,
         "TAURUS" : 2,
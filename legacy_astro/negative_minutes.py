@@ -6,13 +6,11 @@ import csv
 import sys
 import os
 #third party
-from immanuel import charts
 from immanuel.const import chart, dignities
 from immanuel.classes.serialize import ToJSON
 from immanuel.setup import settings
 import pandas as pd
 import numpy as np
-from immanuel import charts
 from immanuel.const import chart, dignities
 from immanuel.classes.serialize import ToJSON
 from immanuel.setup import settings
@@ -24,6 +22,7 @@ import csv
 #yours
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from legacy_astro.settings_astro import astro_avanzada_settings
+from legacy_astro.chart_cache import natal_cacheado
 
 #run your settings
 astro_avanzada_settings()
@@ -42,8 +41,7 @@ class negativeMinutes:
         try:
              
             # carta b(n)
-            self.subject_bn = charts.Subject(dob_bn, lat_bn, lon_bn)
-            self.natal_bn = charts.Natal(self.subject_bn)
+            self.natal_bn = natal_cacheado(dob_bn, lat_bn, lon_bn)
             self.aspects_json_bn = json.dumps(self.natal_bn.aspects, cls=ToJSON, indent=4)
             self.aspect_json_bn = json.loads(self.aspects_json_bn)
             self.objects_json_bn = json.dumps(self.natal_bn.objects, cls=ToJSON, indent=4)
@@ -54,8 +52,7 @@ class negativeMinutes:
             self.r10_bn = str(dignities.TRADITIONAL_RULERSHIPS[self.house_10_sign_bn])
             
             # carta natal a 
-            self.subject_a = charts.Subject(dob_a, lat_a, lon_a)
-            self.natal_a = charts.Natal(self.subject_a)
+            self.natal_a = natal_cacheado(dob_a, lat_a, lon_a)
             self.aspects_json_a = json.dumps(self.natal_a.aspects, cls=ToJSON, indent=4)
             self.aspect_json_a = json.loads(self.aspects_json_a)
             self.objects_json_a = json.dumps(self.natal_a.objects, cls=ToJSON, indent=4)
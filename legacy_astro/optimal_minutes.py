@@ -6,13 +6,11 @@ import csv
 import sys
 import os
 #third party
-from immanuel import charts
 from immanuel.const import chart, dignities
 from immanuel.classes.serialize import ToJSON
 from immanuel.setup import settings
 import pandas as pd
 import numpy as np
-from immanuel import charts
 from immanuel.const import chart, dignities
 from immanuel.classes.serialize import ToJSON
 from immanuel.setup import settings
@@ -22,6 +20,7 @@ import csv
 #yours
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from legacy_astro.settings_astro import astro_avanzada_settings
+from legacy_astro.chart_cache import natal_cacheado
 
 #run your settings
 astro_avanzada_settings()
@@ -34,8 +33,7 @@ class optimalMinutes:
         self.lon = lon
        
         try:
-            self.subject = charts.Subject(dob, lat, lon)
-            self.natal = charts.Natal(self.subject)
+            self.natal = natal_cacheado(dob, lat, lon)
             self.aspects_json = json.dumps(self.natal.aspects, cls=ToJSON, indent=4)
             self.aspect_json = json.loads(self.aspects_json)
             self.objects_json = json.dumps(self.natal.objects, cls=ToJSON, indent=4)
@@ -5,7 +5,6 @@ import csv
 import sys
 import os
 #third party
-from immanuel import charts
 from immanuel.const import chart, dignities
 from immanuel.classes.serialize import ToJSON
 from immanuel.setup import settings
@@ -14,6 +13,7 @@ import numpy as np
 #yours
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from legacy_astro.settings_astro import astro_avanzada_settings
+from legacy_astro.chart_cache import natal_cacheado
 
 #run your settings
 astro_avanzada_settings()
@@ -25,8 +25,7 @@ class rulershipConditions:
         self.lon = lon
         self.activity = act
         try:
-            self.subject = charts.Subject(dob, lat, lon)
-            self.natal = charts.Natal(self.subject)
+            self.natal = natal_cacheado(dob, lat, lon)
             aspects_json = json.dumps(self.natal.aspects, cls=ToJSON, indent=4)
             self.aspect_json = json.loads(aspects_json)
             objects_json = json.dumps(self.natal.objects, cls=ToJSON, indent=4)
@@ -1,26 +1,31 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, date
 
 # Importar getter de config para validación
 # Nota: Asumimos que config.py está accesible. 
 # Si no, deberemos mover get_temas_disponibles a un lugar común o duplicar la validación.
 try:
-    from config import get_temas_disponibles
+    from config import get_temas_disponibles, TEMAS_VALIDOS
 except ImportError:
     # Fallback si falla la importación durante generación de esquema
     def get_temas_disponibles():
-        return ["trabajo", "amor", "salud", "dinero", "viajes"]
+        return ("trabajo", "amor", "salud", "dinero", "viajes")
+
+    TEMAS_VALIDOS = frozenset(get_temas_disponibles())
 
 class CartaNatalData(BaseModel):
     """Modelo para datos de carta natal"""
+    model_config = ConfigDict(frozen=True)
+
     fecha_nacimiento: str = Field(..., description="Fecha de nacimiento (YYYY-MM-DD)")
     hora_nacimiento: str = Field(..., description="Hora de nacimiento (HH:MM)")
     ciudad: str = Field(..., description="Ciudad de nacimiento")
     pais: str = Field(..., description="País de nacimiento")
     timezone: str = Field(..., description="Zona horaria")
 
-    @validator('fecha_nacimiento')
+    @field_validator('fecha_nacimiento')
+    @classmethod
     def validar_fecha(cls, v):
         try:
             datetime.strptime(v, '%Y-%m-%d')
@@ -28,7 +33,8 @@ class CartaNatalData(BaseModel):
         except ValueError:
             raise ValueError("Formato de fecha debe ser YYYY-MM-DD")
 
-    @validator('hora_nacimiento')
+    @field_validator('hora_nacimiento')
+    @classmethod
     def validar_hora(cls, v):
         try:
             datetime.strptime(v, '%H:%M')
@@ -38,28 +44,22 @@ class CartaNatalData(BaseModel):
 
 class BusquedaRequest(BaseModel):
     """Modelo para solicitud de búsqueda de carta electiva"""
+    model_config = ConfigDict(frozen=True)
+
     user_id: str = Field(..., description="ID del usuario")
     tema: str = Field(..., description="Tema astrológico (trabajo, amor, etc.)")
-    fecha_inicio: str = Field(..., description="Fecha de inicio (YYYY-MM-DD)")
+    fecha_inicio: date = Field(..., description="Fecha de inicio (YYYY-MM-DD)")
     dias: int = Field(30, ge=1, le=365, description="Número de días a analizar")
     ubicacion: Dict[str, str] = Field(..., description="Ubicación con ciudad y país")
     carta_natal: CartaNatalData = Field(..., description="Datos de carta natal del usuario")
 
-    @validator('tema')
+    @field_validator('tema')
+    @classmethod
     def validar_tema(cls, v):
-        temas_validos = get_temas_disponibles()
-        if v not in temas_validos:
-            raise ValueError(f"Tema '{v}' no válido. Disponibles: {temas_validos}")
+        if v not in TEMAS_VALIDOS:
+            raise ValueError(f"Tema '{v}' no válido. Disponibles: {list(get_temas_disponibles())}")
         return v
 
-    @validator('fecha_inicio')
-    def validar_fecha(cls, v):
-        try:
-            datetime.strptime(v, '%Y-%m-%d')
-            return v
-        except ValueError:
-            raise ValueError("Formato de fecha debe ser YYYY-MM-DD")
-
 class MomentoElectivo(BaseModel):
     """Modelo para un momento electivo encontrado"""
     ranking: int = Field(..., description="Posición en el ranking (1 es mejor)")
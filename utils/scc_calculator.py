@@ -7,6 +7,7 @@ y relativa del enraizamiento para evitar sesgos y proporcionar contexto preciso.
 """
 
 import numpy as np
+from bisect import bisect_left
 from typing import List, Dict, Tuple
 from datetime import datetime
 
@@ -41,6 +42,38 @@ class SCC_Calculator:
             enraizamiento_puntos: Puntos absolutos de enraizamiento (-6 a +10)
             valores_referencia: Lista de valores del período para contextualizar
 
+        Returns:
+            Dict con SCC y metadatos
+        """
+        return cls.calcular_scc_desde_stats(enraizamiento_puntos, cls.precalcular_stats(valores_referencia))
+
+    @classmethod
+    def precalcular_stats(cls, valores_referencia: List[float] = None) -> Dict:
+        """
+        Precalcula la referencia del período una sola vez para reutilizarla
+        en varios momentos (evita reordenar los valores en cada llamada)
+
+        Args:
+            valores_referencia: Lista de valores del período para contextualizar
+
+        Returns:
+            Dict con valores ordenados y cantidad
+        """
+        valores_ordenados = sorted(valores_referencia) if valores_referencia else []
+        return {
+            'valores_ordenados': valores_ordenados,
+            'n': len(valores_ordenados)
+        }
+
+    @classmethod
+    def calcular_scc_desde_stats(cls, enraizamiento_puntos: float, stats: Dict) -> Dict:
+        """
+        Calcula el SCC usando una referencia precalculada con precalcular_stats
+
+        Args:
+            enraizamiento_puntos: Puntos absolutos de enraizamiento (-6 a +10)
+            stats: Referencia del período devuelta por precalcular_stats
+
         Returns:
             Dict con SCC y metadatos
         """
@@ -48,8 +81,8 @@ class SCC_Calculator:
         absoluto_pct = cls._calcular_componente_absoluto(enraizamiento_puntos)
 
         # Calcular componente relativo
-        if valores_referencia and len(valores_referencia) > 1:
-            relativo_pct = cls._calcular_componente_relativo(enraizamiento_puntos, valores_referencia)
+        if stats['n'] > 1:
+            relativo_pct = cls._percentil_en_ordenados(enraizamiento_puntos, stats['valores_ordenados'])
         else:
             # Fallback: usar percentil aproximado basado en el valor absoluto
             relativo_pct = cls._estimar_percentil_aproximado(enraizamiento_puntos)
@@ -72,6 +105,13 @@ class SCC_Calculator:
             'motivo_no_recomendable': None if recomendable else cls._get_motivo_no_recomendable(scc, absoluto_pct)
         }
 
+    @classmethod
+    def categoria_desde_stats(cls, enraizamiento_puntos: float, stats: Dict) -> str:
+        """
+        Devuelve solo la categoría SCC usando una referencia precalculada
+        """
+        return cls.calcular_scc_desde_stats(enraizamiento_puntos, stats)['categoria']
+
     @classmethod
     def _calcular_componente_absoluto(cls, puntos: float) -> float:
         """
@@ -94,26 +134,32 @@ class SCC_Calculator:
         if not valores_referencia:
             return 50.0
 
-        valores_ordenados = sorted(valores_referencia)
+        return cls._percentil_en_ordenados(puntos, sorted(valores_referencia))
+
+    @classmethod
+    def _percentil_en_ordenados(cls, puntos: float, valores_ordenados: List[float]) -> float:
+        """
+        Percentil interpolado de puntos dentro de valores ya ordenados (búsqueda binaria)
+        """
         n = len(valores_ordenados)
 
-        # Encontrar percentil usando interpolación
-        for i, valor in enumerate(valores_ordenados):
-            if puntos <= valor:
-                if i == 0:
-                    return 0.0
-                elif puntos == valor:
-                    return (i / n) * 100.0
-                else:
-                    # Interpolación lineal
-                    prev_valor = valores_ordenados[i-1]
-                    if valor != prev_valor:
-                        interpolacion = (puntos - prev_valor) / (valor - prev_valor)
-                        return ((i-1 + interpolacion) / n) * 100.0
-                    else:
-                        return (i / n) * 100.0
-
-        return 100.0
+        # Primer índice con puntos <= valor
+        i = bisect_left(valores_ordenados, puntos)
+        if i == n:
+            return 100.0
+        if i == 0:
+            return 0.0
+
+        valor = valores_ordenados[i]
+        if puntos == valor:
+            return (i / n) * 100.0
+
+        # Interpolación lineal
+        prev_valor = valores_ordenados[i-1]
+        if valor != prev_valor:
+            interpolacion = (puntos - prev_valor) / (valor - prev_valor)
+            return ((i-1 + interpolacion) / n) * 100.0
+        return (i / n) * 100.0
 
     @classmethod
     def _estimar_percentil_aproximado(cls, puntos: float) -> float:
@@ -180,17 +226,13 @@ class SCC_Calculator:
             return momentos
 
         # Extraer valores de enraizamiento para referencia
-        valores_enraizamiento = []
-        for momento in momentos:
-            # Intentar obtener enraizamiento puro de diferentes fuentes
-            enraizamiento = cls._extraer_enraizamiento_puro(momento)
-            valores_enraizamiento.append(enraizamiento)
+        valores_enraizamiento = [cls._extraer_enraizamiento_puro(momento) for momento in momentos]
+        stats = cls.precalcular_stats(valores_enraizamiento)
 
         # Procesar cada momento
         momentos_con_scc = []
-        for momento in momentos:
-            enraizamiento_puntos = cls._extraer_enraizamiento_puro(momento)
-            scc_data = cls.calcular_scc(enraizamiento_puntos, valores_enraizamiento)
+        for momento, enraizamiento_puntos in zip(momentos, valores_enraizamiento):
+            scc_data = cls.calcular_scc_desde_stats(enraizamiento_puntos, stats)
 
             # Agregar SCC al momento
             momento_con_scc = momento.copy()